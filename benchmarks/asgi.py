@@ -0,0 +1,173 @@
+"""Запросы в секунду к страницам чтения: WSGI против ASGI.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.asgi --concurrency 64 --requests 2000
+
+Сервер не нужен: запросы подаются прямо в обработчики Django. Путь WSGI
+моделирует потоковый сервер: ``--threads`` потоков по очереди вызывают
+синхронный обработчик с обычными представлениями. Путь ASGI держит
+``--concurrency`` одновременных запросов в одном цикле событий и
+использует асинхронные представления (``ASYNC_READ_VIEWS``), которые
+обращаются к базе через ограниченный пул ``ASYNC_DB_WORKERS``. Каждый
+режим запускается в отдельном процессе на одной и той же базе.
+
+С локальной SQLite запросы почти не ждут ввода-вывода, и время уходит на
+Python под GIL, поэтому асинхронный путь выигрывает мало. ``--latency``
+добавляет задержку к каждому запросу к базе, как у сетевой СУБД: в этом
+режиме ожидания перекрываются, и разница видна.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import setup_django
+from benchmarks.load import percentile
+from benchmarks.seed import seed
+
+MODES = ('wsgi', 'asgi')
+
+
+def _add_latency(latency):
+    from django.db.backends.signals import connection_created
+
+    def delayed(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def on_connect(sender, connection, **kwargs):
+        # execute_wrapper() blocks pop the last wrapper on exit, so this
+        # permanent one must sit below any of them.
+        connection.execute_wrappers.insert(0, delayed)
+
+    connection_created.connect(on_connect, weak=False)
+
+
+def _setup(db_path, mode, latency):
+    setup_django(db_path)
+
+    from django.conf import settings
+
+    # The debug toolbar middleware is sync-only and would turn the whole
+    # ASGI middleware chain synchronous.
+    settings.MIDDLEWARE = [
+        name for name in settings.MIDDLEWARE if 'debug_toolbar' not in name]
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.ASYNC_READ_VIEWS = mode == 'asgi'
+    if latency:
+        _add_latency(latency / 1000)
+
+
+def get_urls():
+    from django.urls import reverse
+
+    from blog.queryset import get_posts_queryset
+
+    posts = get_posts_queryset(apply_filters=True)[:50]
+    urls = [reverse('blog:index')]
+    for post in posts:
+        urls.append(reverse('blog:post_detail', args=(post.id,)))
+        urls.append(reverse('blog:category_posts', args=(post.category.slug,)))
+        urls.append(reverse('blog:profile', args=(post.author.username,)))
+    return urls
+
+
+def _run_wsgi(urls, requests, threads):
+    from django.test import Client
+
+    local = threading.local()
+
+    def get(url):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+        client = local.client
+        started = time.perf_counter()
+        response = client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(
+            get, (urls[index % len(urls)] for index in range(requests))))
+
+
+async def _run_asgi(urls, requests, concurrency):
+    from django.test.client import AsyncClient
+
+    client = AsyncClient()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def get(url):
+        async with slots:
+            started = time.perf_counter()
+            response = await client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+            return (time.perf_counter() - started) * 1000
+
+    return await asyncio.gather(*(
+        get(urls[index % len(urls)]) for index in range(requests)))
+
+
+def _run_mode(args):
+    db_path, mode, requests, concurrency, threads, latency = args
+    _setup(db_path, mode, latency)
+    urls = get_urls()
+    started = time.perf_counter()
+    if mode == 'wsgi':
+        timings = _run_wsgi(urls, requests, threads)
+    else:
+        timings = asyncio.run(_run_asgi(urls, requests, concurrency))
+    elapsed = time.perf_counter() - started
+    return {
+        'requests_per_s': round(len(timings) / elapsed, 1),
+        'p50_ms': round(percentile(timings, 0.5), 2),
+        'p99_ms': round(percentile(timings, 0.99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=10_000)
+    parser.add_argument('--comments', type=int, default=None,
+                        help='По умолчанию — пять на публикацию.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64,
+                        help='Одновременных запросов в режиме ASGI.')
+    parser.add_argument('--threads', type=int, default=16,
+                        help='Потоков сервера в режиме WSGI.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Задержка каждого запроса к базе, мс; '
+                             'моделирует сетевую СУБД.')
+    parser.add_argument('--db', help='Путь к файлу базы для замеров.')
+    args = parser.parse_args()
+    if args.comments is None:
+        args.comments = args.posts * 5
+    db_path = str(setup_django(args.db))
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from blog.models import Post
+
+    print(f'База для замеров: {db_path}')
+    call_command('migrate', verbosity=0, skip_checks=True)
+    if not Post.objects.exists():
+        seed(args.posts, args.comments, args.seed)
+    connection.close()
+
+    context = multiprocessing.get_context('spawn')
+    for mode in MODES:
+        with context.Pool(1) as pool:
+            summary = pool.apply(_run_mode, ((
+                db_path, mode, args.requests, args.concurrency,
+                args.threads, args.latency),))
+        print(f'{mode:>5}: ' + ', '.join(
+            f'{name} {value}' for name, value in summary.items()))
+
+
+if __name__ == '__main__':
+    main()
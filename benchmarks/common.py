@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def setup_django(db_path=None, **database_options):
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    if db_path is None:
+        db_path = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = str(db_path)
+    settings.DATABASES['default'].update(database_options)
+    settings.DEBUG = False
+    django.setup()
+    return db_path
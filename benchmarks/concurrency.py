@@ -0,0 +1,138 @@
+"""Пропускная способность SQLite при нескольких одновременных клиентах.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.concurrency --workers 8 --duration 10
+
+Каждый процесс-клиент в течение ``--duration`` секунд открывает
+страницы блога и с вероятностью ``--write-ratio`` добавляет комментарий.
+Замер выполняется дважды на одной и той же базе: с настройками SQLite по
+умолчанию (журнал DELETE, без ``SQLITE_PRAGMAS``, новое соединение на
+каждый запрос) и с настройками проекта (WAL, ``SQLITE_PRAGMAS``,
+``CONN_MAX_AGE``). Ошибки «database is locked» считаются отдельно.
+"""
+import argparse
+import logging
+import multiprocessing
+import random
+import sqlite3
+import time
+
+from benchmarks.common import setup_django
+from benchmarks.load import percentile
+from benchmarks.seed import seed
+
+PROFILES = ('default', 'tuned')
+
+
+def _run_worker(args):
+    db_path, profile, worker, duration, write_ratio = args
+    options = {} if profile == 'tuned' else {'CONN_MAX_AGE': 0}
+    setup_django(db_path, **options)
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    from blog.queryset import get_posts_queryset
+
+    logging.disable(logging.WARNING)
+    if profile == 'default':
+        settings.SQLITE_PRAGMAS = {}
+    setup_test_environment()
+    rng = random.Random(worker)
+    users = list(get_user_model().objects.values_list('pk', flat=True))
+    post_ids = list(
+        get_posts_queryset(apply_filters=True).values_list('pk', flat=True))
+    client = Client()
+    client.force_login(get_user_model().objects.get(pk=rng.choice(users)))
+    result = {'reads': [], 'writes': [], 'locked': 0}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        post_id = rng.choice(post_ids)
+        is_write = rng.random() < write_ratio
+        started = time.perf_counter()
+        try:
+            if is_write:
+                client.post(
+                    reverse('blog:add_comment', args=(post_id,)),
+                    {'text': f'Комментарий {worker}'})
+            elif rng.random() < 0.5:
+                client.get(reverse('blog:index'))
+            else:
+                client.get(reverse('blog:post_detail', args=(post_id,)))
+        except OperationalError:
+            result['locked'] += 1
+            continue
+        elapsed = (time.perf_counter() - started) * 1000
+        result['writes' if is_write else 'reads'].append(elapsed)
+    return result
+
+
+def set_journal_mode(db_path, mode):
+    with sqlite3.connect(db_path) as db:
+        db.execute(f'PRAGMA journal_mode = {mode}')
+
+
+def run_profile(db_path, profile, workers, duration, write_ratio):
+    set_journal_mode(db_path, 'WAL' if profile == 'tuned' else 'DELETE')
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers) as pool:
+        results = pool.map(_run_worker, [
+            (db_path, profile, worker, duration, write_ratio)
+            for worker in range(workers)
+        ])
+    reads = [value for result in results for value in result['reads']]
+    writes = [value for result in results for value in result['writes']]
+    summary = {
+        'reads_per_s': round(len(reads) / duration, 1),
+        'writes_per_s': round(len(writes) / duration, 1),
+        'locked': sum(result['locked'] for result in results),
+    }
+    for name, timings in (('read', reads), ('write', writes)):
+        if timings:
+            summary[f'{name}_p50_ms'] = round(percentile(timings, 0.5), 2)
+            summary[f'{name}_p99_ms'] = round(percentile(timings, 0.99), 2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=10_000)
+    parser.add_argument('--comments', type=int, default=None,
+                        help='По умолчанию — пять на публикацию.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='Длительность замера каждого профиля, с.')
+    parser.add_argument('--write-ratio', type=float, default=0.2,
+                        help='Доля запросов, добавляющих комментарий.')
+    parser.add_argument('--db', help='Путь к файлу базы для замеров.')
+    args = parser.parse_args()
+    if args.comments is None:
+        args.comments = args.posts * 5
+    db_path = str(setup_django(args.db))
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from blog.models import Post
+
+    print(f'База для замеров: {db_path}')
+    call_command('migrate', verbosity=0, skip_checks=True)
+    if not Post.objects.exists():
+        seed(args.posts, args.comments, args.seed)
+    connection.close()
+
+    for profile in PROFILES:
+        summary = run_profile(
+            db_path, profile, args.workers, args.duration, args.write_ratio)
+        print(f'{profile:>8}: ' + ', '.join(
+            f'{name} {value}' for name, value in summary.items()))
+
+
+if __name__ == '__main__':
+    main()
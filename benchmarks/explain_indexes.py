@@ -0,0 +1,109 @@
+"""EXPLAIN QUERY PLAN ленты, категории и профиля с составными индексами и без.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.explain_indexes --posts 1000000
+"""
+import argparse
+import time
+
+from benchmarks.common import setup_django
+from benchmarks.seed import seed
+
+FK_INDEXES = {
+    'post': ('author',),
+    'comment': ('post',),
+}
+
+
+def get_queries():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Comment
+    from blog.queryset import get_posts_queryset
+
+    category = Category.objects.only('id').filter(is_published=True).first()
+    user = get_user_model().objects.first()
+    return {
+        'feed': get_posts_queryset(apply_filters=True)[:10],
+        'category': get_posts_queryset(
+            manager=category.posts, apply_filters=True)[:10],
+        'profile (owner)': get_posts_queryset(manager=user.posts)[:10],
+        'profile (guest)': get_posts_queryset(
+            manager=user.posts, apply_filters=True)[:10],
+        'comments': Comment.objects.filter(post_id=1).select_related(
+            'author'),
+    }
+
+
+def get_index_sets():
+    from django.db import models
+
+    from blog.models import Comment, Post
+
+    fk_indexes = [
+        (model, models.Index(
+            fields=(field,), name=f'bench_{model_name}_{field}_idx'))
+        for model_name, model in (('post', Post), ('comment', Comment))
+        for field in FK_INDEXES[model_name]
+    ]
+    composite_indexes = [
+        (model, index)
+        for model in (Post, Comment)
+        for index in model._meta.indexes
+    ]
+    return fk_indexes, composite_indexes
+
+
+def swap_indexes(remove, add):
+    from django.db import connection
+
+    with connection.schema_editor() as schema_editor:
+        for model, index in remove:
+            schema_editor.remove_index(model, index)
+        for model, index in add:
+            schema_editor.add_index(model, index)
+
+
+def explain(title):
+    from django.db import connection
+
+    print(f'==== {title}')
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+        for name, queryset in get_queries().items():
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = '\n'.join(f'    {row[-1]}' for row in cursor.fetchall())
+            started = time.perf_counter()
+            list(queryset)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f'-- {name}: {elapsed:.1f} ms\n{plan}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--comments', type=int, default=1_000_000)
+    parser.add_argument('--db', help='Путь к файлу базы для замеров.')
+    args = parser.parse_args()
+    db_path = setup_django(args.db)
+
+    from django.core.management import call_command
+
+    print(f'База для замеров: {db_path}')
+    call_command('migrate', verbosity=0, skip_checks=True)
+    fk_indexes, composite_indexes = get_index_sets()
+    swap_indexes(remove=composite_indexes, add=fk_indexes)
+    started = time.perf_counter()
+    seed(args.posts, args.comments)
+    print(f'Заполнение: {time.perf_counter() - started:.1f} s')
+    explain('Только индексы внешних ключей')
+    started = time.perf_counter()
+    swap_indexes(remove=fk_indexes, add=composite_indexes)
+    print(f'Построение индексов: {time.perf_counter() - started:.1f} s')
+    explain('Составные индексы из Meta.indexes')
+
+
+if __name__ == '__main__':
+    main()
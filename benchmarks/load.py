@@ -0,0 +1,180 @@
+"""Задержка, число запросов к БД и пиковая память по страницам блога.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.load --posts 100000 --output report.json
+    python -m benchmarks.load --db bench.sqlite3 --compare report.json
+
+Данные генерируются детерминированно (см. ``benchmarks.seed``), поэтому
+отчёты разных прогонов с одинаковыми ``--posts``, ``--comments`` и
+``--seed`` можно сравнивать между собой. Если файл из ``--db`` уже
+заполнен, повторное заполнение пропускается.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from benchmarks.common import setup_django
+from benchmarks.seed import seed
+
+METRICS = ('p50_ms', 'p99_ms', 'queries', 'peak_memory_kb')
+
+
+def get_endpoints():
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+    from django.urls import reverse
+
+    from blog.models import Category, Post
+    from blog.queryset import get_posts_queryset
+
+    category = (
+        Category.objects.filter(is_published=True)
+        .annotate(n_posts=Count('posts')).order_by('-n_posts').first()
+    )
+    author = (
+        get_user_model().objects.annotate(n_posts=Count('posts'))
+        .order_by('-n_posts').first()
+    )
+    post = (
+        get_posts_queryset(apply_filters=True)
+        .order_by('-comment_count').first()
+    )
+    middle_page = max(
+        Post.objects.count() // settings.PAGINATE_ON_PAGE // 2, 1)
+    return {
+        'index': reverse('blog:index'),
+        'index (deep page)': f"{reverse('blog:index')}?page={middle_page}",
+        'category_posts': reverse(
+            'blog:category_posts', args=(category.slug,)),
+        'profile': reverse('blog:profile', args=(author.username,)),
+        'post_detail': reverse('blog:post_detail', args=(post.id,)),
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def measure(client, url, requests):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    cache.clear()
+    timings, queries = [], []
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, (url, response.status_code)
+        queries.append(len(captured))
+
+    cache.clear()
+    tracemalloc.start()
+    client.get(url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'p50_ms': round(percentile(timings, 0.5), 2),
+        'p99_ms': round(percentile(timings, 0.99), 2),
+        'cold_ms': round(timings[0], 2),
+        'queries': round(statistics.mean(queries), 2),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def get_git_revision():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'), capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, previous):
+    print(f"Сравнение с {previous['meta'].get('revision')}"
+          f" от {previous['meta'].get('date')}:")
+    for name, metrics in report['endpoints'].items():
+        before = previous['endpoints'].get(name)
+        if before is None:
+            continue
+        deltas = []
+        for metric in METRICS:
+            if before.get(metric):
+                change = (metrics[metric] / before[metric] - 1) * 100
+                deltas.append(f'{metric} {change:+.0f}%')
+        print(f"  {name}: {', '.join(deltas)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=10_000)
+    parser.add_argument('--comments', type=int, default=None,
+                        help='По умолчанию — пять на публикацию.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=100,
+                        help='Число запросов к каждой странице.')
+    parser.add_argument('--db', help='Путь к файлу базы для замеров.')
+    parser.add_argument('--output', default='benchmark-report.json')
+    parser.add_argument('--compare', help='Отчёт прошлого прогона.')
+    args = parser.parse_args()
+    if args.comments is None:
+        args.comments = args.posts * 5
+    db_path = setup_django(args.db)
+
+    from django.core.management import call_command
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    from blog.models import Post
+
+    setup_test_environment()
+    print(f'База для замеров: {db_path}')
+    call_command('migrate', verbosity=0, skip_checks=True)
+    if not Post.objects.exists():
+        started = time.perf_counter()
+        seed(args.posts, args.comments, args.seed)
+        print(f'Заполнение: {time.perf_counter() - started:.1f} s')
+
+    client = Client()
+    report = {
+        'meta': {
+            'date': datetime.now(dt_timezone.utc).isoformat(),
+            'revision': get_git_revision(),
+            'python': platform.python_version(),
+            'posts': args.posts,
+            'comments': args.comments,
+            'seed': args.seed,
+            'requests': args.requests,
+        },
+        'endpoints': {},
+    }
+    for name, url in get_endpoints().items():
+        metrics = measure(client, url, args.requests)
+        report['endpoints'][name] = {'url': url, **metrics}
+        print(f"{name:>18}: p50 {metrics['p50_ms']} ms,"
+              f" p99 {metrics['p99_ms']} ms, {metrics['queries']} запросов,"
+              f" {metrics['peak_memory_kb']} KiB")
+
+    Path(args.output).write_text(
+        json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'Отчёт: {args.output}')
+    if args.compare:
+        compare(report, json.loads(
+            Path(args.compare).read_text(encoding='utf-8')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Детерминированное заполнение базы для замеров.
+
+Справочники и пользователи создаются через mixer, тексты публикаций и
+комментариев берутся из пула, сгенерированного Faker. Публикации и
+комментарии вставляются пачками в обход ORM, поэтому миллион строк
+заполняется за минуты. Комментарии распределены по закону Ципфа: у
+немногих публикаций их сотни, у большинства — единицы или ни одного.
+"""
+import io
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+N_USERS = 1000
+N_CATEGORIES = 20
+N_LOCATIONS = 50
+TEXT_POOL_SIZE = 1000
+ZIPF_EXPONENT = 1.1
+START_DATE = datetime(2015, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _seed_random(seed_value):
+    from faker import Faker
+
+    random.seed(seed_value)
+    Faker.seed(seed_value)
+
+
+def _text_pool(seed_value):
+    from faker import Faker
+
+    fake = Faker('ru_RU')
+    fake.seed_instance(seed_value)
+    return (
+        [fake.sentence(nb_words=6)[:256] for _ in range(TEXT_POOL_SIZE)],
+        [fake.paragraph(nb_sentences=8) for _ in range(TEXT_POOL_SIZE)],
+        [fake.sentence(nb_words=12) for _ in range(TEXT_POOL_SIZE)],
+    )
+
+
+def _create_references(rnd):
+    from django.contrib.auth import get_user_model
+    from mixer.backend.django import mixer
+
+    from blog.models import Category, Location
+
+    mixer.cycle(N_USERS).blend(get_user_model())
+    categories = mixer.cycle(N_CATEGORIES).blend(
+        Category, is_published=True)
+    mixer.cycle(N_LOCATIONS).blend(Location, is_published=True)
+    hidden = rnd.sample(categories, N_CATEGORIES // 10)
+    Category.objects.filter(pk__in=[c.pk for c in hidden]).update(
+        is_published=False)
+
+
+def seed(n_posts, n_comments, seed_value=0):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    from blog.models import Category, Comment, Location, Post
+
+    _seed_random(seed_value)
+    rnd = random.Random(seed_value)
+    titles, texts, comment_texts = _text_pool(seed_value)
+    _create_references(rnd)
+    user_ids = list(get_user_model().objects.values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    location_ids = list(Location.objects.values_list('id', flat=True))
+    now = datetime.now(dt_timezone.utc)
+    span = int((now - START_DATE).total_seconds())
+    # Небольшая доля публикаций отложена на сутки вперёд.
+    future = 86400
+
+    def posts():
+        for _ in range(n_posts):
+            pub_date = START_DATE + timedelta(
+                seconds=rnd.randrange(span + future))
+            yield (
+                rnd.random() > 0.05, now, now, rnd.choice(titles),
+                rnd.choice(texts), pub_date, rnd.choice(user_ids),
+                rnd.choice(location_ids), rnd.choice(category_ids), '', 0,
+                '{}', '', 0,
+            )
+
+    def comments(post_ids):
+        ranked = post_ids[:]
+        rnd.shuffle(ranked)
+        weights = [1 / rank ** ZIPF_EXPONENT
+                   for rank in range(1, len(ranked) + 1)]
+        chosen = rnd.choices(ranked, weights=weights, k=n_comments)
+        for post_id in chosen:
+            yield (rnd.choice(comment_texts), post_id, now,
+                   rnd.choice(user_ids))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {Post._meta.db_table} (is_published, created_at,'
+            ' updated_at, title, text, pub_date, author_id, location_id,'
+            ' category_id, image, comment_count, image_variants, image_status,'
+            ' image_attempts) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s,'
+            ' %s, %s, %s, %s)',
+            posts())
+        post_ids = list(Post.objects.values_list('id', flat=True))
+        if post_ids and n_comments:
+            cursor.executemany(
+                f'INSERT INTO {Comment._meta.db_table} (text, post_id,'
+                ' created_at, author_id) VALUES (%s, %s, %s, %s)',
+                comments(post_ids))
+    call_command(
+        'recount_comments', skip_checks=True, stdout=io.StringIO())
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.db.models import Case, F, When
+
+from .models import Category, Comment, Post
+from .paginator import paginate_by_keyset
+from .queryset import get_posts_queryset
+
+API_FIELDS = {
+    'posts': {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'api_location',
+        'image': 'image',
+        'comment_count': 'comment_count',
+    },
+    'comments': {
+        'id': 'id',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created_at': 'created_at',
+    },
+    'categories': {
+        'id': 'id',
+        'title': 'title',
+        'slug': 'slug',
+        'description': 'description',
+    },
+}
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+def parse_fields(kind, value):
+    if not value:
+        return list(API_FIELDS[kind])
+    fields = list(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in API_FIELDS[kind]]
+    if unknown:
+        raise InvalidQuery(f'Неизвестные поля: {", ".join(unknown)}.')
+    return fields
+
+
+def parse_limit(value):
+    if not value:
+        return settings.PAGINATE_ON_PAGE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise InvalidQuery('Параметр limit должен быть числом.')
+    if not 1 <= limit <= settings.API_MAX_LIMIT:
+        raise InvalidQuery(
+            f'Параметр limit должен быть от 1 до {settings.API_MAX_LIMIT}.')
+    return limit
+
+
+def get_api_posts(category=None, author=None):
+    queryset = get_posts_queryset(apply_filters=True)
+    if category:
+        queryset = queryset.filter(category__slug=category)
+    if author:
+        queryset = queryset.filter(author__username=author)
+    return queryset.annotate(api_location=Case(
+        When(location__is_published=True, then=F('location__name'))))
+
+
+def get_api_comments(post_id):
+    return Comment.objects.filter(post_id=post_id)
+
+
+def get_api_categories():
+    return Category.objects.filter(is_published=True).order_by('title')
+
+
+def get_api_rows(queryset, kind, fields, key_field=None):
+    lookups = [API_FIELDS[kind][name] for name in fields]
+    if key_field is not None:
+        lookups += [key_field, 'id']
+    return queryset.values(*dict.fromkeys(lookups))
+
+
+def paginate_api_rows(queryset, kind, fields, limit, after=None,
+                      before=None, key_field='pub_date', ascending=False):
+    return paginate_by_keyset(
+        get_api_rows(queryset, kind, fields, key_field), limit,
+        after=after, before=before, key_field=key_field, ascending=ascending)
+
+
+def serialize_rows(rows, kind, fields):
+    lookups = [API_FIELDS[kind][name] for name in fields]
+    storage = Post.image.field.storage
+    items = []
+    for row in rows:
+        item = {name: row[lookup] for name, lookup in zip(fields, lookups)}
+        if kind == 'posts' and 'image' in item:
+            name = item['image']
+            item['image'] = storage.url(name) if name else None
+        items.append(item)
+    return items
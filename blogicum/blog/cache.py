@@ -0,0 +1,160 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from .models import Category, Comment, Location, Post
+from .queryset import get_next_publication, get_publication_cutoff
+from .sitemaps import get_shard
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+PAGE_CACHE_OUTCOMES = ('hits', 'misses')
+FEEDS_TAG = 'feeds'
+SITEMAPS_TAG = 'sitemaps'
+
+
+def get_post_card_version(post):
+    category = post.category
+    location = post.location
+    state = (
+        post.title, post.text, post.pub_date, post.is_published,
+        post.image.name, post.image_variants, post.image_status,
+        post.comment_count, post.author.username,
+        category and (category.slug, category.title, category.is_published),
+        location and (location.name, location.is_published),
+    )
+    return hashlib.md5(repr(state).encode()).hexdigest()
+
+
+def get_post_card_key(post):
+    return f'post_card:{post.pk}:{get_post_card_version(post)}'
+
+
+def render_post_cards(posts):
+    keys = [get_post_card_key(post) for post in posts]
+    cards = cache.get_many(keys)
+    missing = {}
+    for key, post in zip(keys, posts):
+        if key not in cards:
+            missing[key] = render_to_string(POST_CARD_TEMPLATE, {'post': post})
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+        cards.update(missing)
+    return [mark_safe(cards[key]) for key in keys]
+
+
+def get_page_tag_versions(tags):
+    keys = [f'page_cache:tag:{tag}' for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def get_page_cache_key(request, tags):
+    url = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    cutoff = int(get_publication_cutoff().timestamp())
+    versions = ':'.join(map(str, get_page_tag_versions(tags)))
+    return f'page_cache:page:{url}:{cutoff}:{versions}'
+
+
+def invalidate_pages(tags):
+    cache.delete_many([f'page_cache:tag:{tag}' for tag in tags])
+
+
+def get_scheduled_timeout(timeout, queryset=Post.objects):
+    # Scheduled posts become visible without a save signal, so an entry
+    # listing them expires once the cut-off passes the next pub_date.
+    next_publication = get_next_publication(queryset)
+    if next_publication is None:
+        return timeout
+    seconds = (next_publication - timezone.now()).total_seconds()
+    seconds += settings.PUBLICATION_CUTOFF_BUCKET
+    return max(1, min(timeout, math.ceil(seconds)))
+
+
+def get_feed_cache_key(request):
+    # Feeds ignore the query string, so cache-busting parameters added by
+    # feed readers must not make new entries.
+    url = hashlib.md5(request.path.encode()).hexdigest()
+    version, = get_page_tag_versions([FEEDS_TAG])
+    return f'feed:{url}:{version}'
+
+
+def invalidate_feeds():
+    invalidate_pages([FEEDS_TAG])
+
+
+def get_sitemap_cache_key(request, section=None, shard=None):
+    if section is None:
+        tags = [SITEMAPS_TAG, f'{SITEMAPS_TAG}:index']
+    else:
+        tags = [SITEMAPS_TAG, f'{SITEMAPS_TAG}:{section}:{shard}']
+    # Sitemaps embed absolute URLs but ignore the query string.
+    url = hashlib.md5(
+        request.build_absolute_uri(request.path).encode()).hexdigest()
+    versions = ':'.join(map(str, get_page_tag_versions(tags)))
+    return f'sitemap:{url}:{versions}'
+
+
+def invalidate_sitemaps(section=None, pk=None):
+    if section is None:
+        invalidate_pages([SITEMAPS_TAG])
+        return
+    # Only the shard holding the object and the index listing its lastmod
+    # are rebuilt; the other shards stay cached.
+    invalidate_pages([
+        f'{SITEMAPS_TAG}:index', f'{SITEMAPS_TAG}:{section}:{get_shard(pk)}'])
+
+
+def _get_post_page_tags(post_id):
+    tags = {'index', f'post:{post_id}'}
+    for category_slug in Post.objects.filter(pk=post_id).values_list(
+            'category__slug', flat=True):
+        tags.add(f'category:{category_slug}')
+    return tags
+
+
+def get_page_cache_tags(instance):
+    # Detail pages also carry their category and location tags, so a
+    # category or location change bumps a single version instead of one
+    # per post.
+    if isinstance(instance, Post):
+        return _get_post_page_tags(instance.pk)
+    if isinstance(instance, Comment):
+        return _get_post_page_tags(instance.post_id)
+    if isinstance(instance, Category):
+        return {'index', f'category:{instance.slug}'}
+    if isinstance(instance, Location):
+        return {'index', 'locations', f'location:{instance.pk}'}
+    return set()
+
+
+def count_page_cache(outcome):
+    stats = caches[settings.PAGE_CACHE_STATS_CACHE]
+    key = f'page_cache:{outcome}'
+    if not stats.add(key, 1, None):
+        try:
+            stats.incr(key)
+        except ValueError:
+            pass
+
+
+def get_page_cache_stats():
+    stats = caches[settings.PAGE_CACHE_STATS_CACHE]
+    return {
+        outcome: stats.get(f'page_cache:{outcome}', 0)
+        for outcome in PAGE_CACHE_OUTCOMES
+    }
+
+
+def reset_page_cache_stats():
+    caches[settings.PAGE_CACHE_STATS_CACHE].delete_many(
+        [f'page_cache:{outcome}' for outcome in PAGE_CACHE_OUTCOMES])
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def apply_pragmas(connection, pragmas=None):
+    if connection.vendor != 'sqlite':
+        return
+    if pragmas is None:
+        pragmas = settings.SQLITE_PRAGMAS
+    # The raw DB-API connection keeps these out of query logs and budgets.
+    for name, value in pragmas.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}').close()
@@ -0,0 +1,59 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+db_execute_wrappers = contextvars.ContextVar(
+    'db_execute_wrappers', default=())
+
+
+class BoundedExecutor:
+
+    def __init__(self, workers_setting, name):
+        self.workers_setting = workers_setting
+        self.name = name
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, self.workers_setting),
+                    thread_name_prefix=self.name)
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        # Context variables (replica routing, query timings) follow the
+        # call into the worker thread.
+        call = functools.partial(
+            contextvars.copy_context().run, self.call, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), call)
+
+    def call(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+
+class DatabaseExecutor(BoundedExecutor):
+
+    def call(self, func, *args, **kwargs):
+        close_old_connections()
+        try:
+            with ExitStack() as stack:
+                for wrapper in db_execute_wrappers.get():
+                    for connection in connections.all():
+                        stack.enter_context(
+                            connection.execute_wrapper(wrapper))
+                return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+
+db_executor = DatabaseExecutor('ASYNC_DB_WORKERS', 'async-db')
+render_executor = BoundedExecutor('ASYNC_RENDER_WORKERS', 'async-render')
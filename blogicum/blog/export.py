@@ -0,0 +1,119 @@
+import csv
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Comment, Post
+
+EXPORT_FIELDS = {
+    'posts': {
+        'id': 'id',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'is_published': 'is_published',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'location__name',
+        'image': 'image',
+        'comment_count': 'comment_count',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    },
+    'comments': {
+        'id': 'id',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created_at': 'created_at',
+    },
+}
+EXPORT_CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def get_export_queryset(kind, category=None, author=None, since=None,
+                        until=None):
+    if kind == 'posts':
+        queryset, post_prefix, date_field = Post.objects.all(), '', 'pub_date'
+    else:
+        queryset, post_prefix = Comment.objects.all(), 'post__'
+        date_field = 'created_at'
+    filters = {}
+    if category:
+        filters[f'{post_prefix}category__slug'] = category
+    if author:
+        filters['author__username'] = author
+    if since:
+        filters[f'{date_field}__gte'] = _start_of_day(since)
+    if until:
+        filters[f'{date_field}__lt'] = _start_of_day(until + timedelta(1))
+    return (
+        queryset.filter(**filters).order_by('pk')
+        .values_list(*EXPORT_FIELDS[kind].values())
+    )
+
+
+def _iter_jsonl(names, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+class _Echo:
+
+    def write(self, value):
+        return value
+
+
+def _iter_csv(names, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(names)
+    for row in rows:
+        yield writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in row
+        ])
+
+
+def _buffered(lines):
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= OUTPUT_BUFFER_SIZE:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(kind, format='jsonl', gzip=False, **filters):
+    rows = get_export_queryset(kind, **filters).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE)
+    serialize = _iter_csv if format == 'csv' else _iter_jsonl
+    chunks = _buffered(serialize(list(EXPORT_FIELDS[kind]), rows))
+    return _gzipped(chunks) if gzip else chunks
+
+
+def get_export_filename(kind, format='jsonl', gzip=False):
+    return f'{kind}.{format}{".gz" if gzip else ""}'
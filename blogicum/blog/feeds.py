@@ -0,0 +1,130 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe, quote_etag
+
+from .cache import get_feed_cache_key, get_scheduled_timeout
+from .models import Category, Post
+from .queryset import get_posts_queryset
+
+
+class CachedFeedMixin:
+
+    def __call__(self, request, *args, **kwargs):
+        key = get_feed_cache_key(request)
+        response = cache.get(key)
+        if response is None:
+            response = super().__call__(request, *args, **kwargs)
+            response['ETag'] = quote_etag(
+                hashlib.md5(response.content).hexdigest())
+            cache.set(key, response, request.feed_cache_timeout)
+        last_modified = response.get('Last-Modified')
+        return get_conditional_response(
+            request, etag=response['ETag'],
+            last_modified=last_modified and parse_http_date_safe(
+                last_modified),
+            response=response) or response
+
+    def get_feed(self, obj, request):
+        request.feed_cache_timeout = get_scheduled_timeout(
+            settings.FEED_CACHE_TIMEOUT, self.filter_posts(Post.objects, obj))
+        return super().get_feed(obj, request)
+
+
+class PostsFeed(CachedFeedMixin, Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума.'
+
+    def link(self, obj=None):
+        return reverse('blog:index')
+
+    def filter_posts(self, queryset, obj):
+        return queryset
+
+    def items(self, obj=None):
+        return self.filter_posts(
+            get_posts_queryset(apply_filters=True), obj)[:settings.FEED_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=(post.pk,))
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_categories(self, post):
+        return (post.category.title,)
+
+
+class CategoryPostsFeed(PostsFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True)
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=(category.slug,))
+
+    def filter_posts(self, queryset, category):
+        return queryset.filter(category=category)
+
+
+class AuthorPostsFeed(PostsFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Блогикум: {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}.'
+
+    def link(self, author):
+        return reverse('blog:profile', args=(author.username,))
+
+    def filter_posts(self, queryset, author):
+        return queryset.filter(author=author)
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class AtomCategoryPostsFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, category):
+        return self.description(category)
+
+
+class AtomAuthorPostsFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
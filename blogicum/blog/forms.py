@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 
+from .export import EXPORT_CONTENT_TYPES
 from .models import Comment, Post
 
 User = get_user_model()
@@ -37,3 +38,25 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class ExportForm(forms.Form):
+    format = forms.ChoiceField(
+        choices=[(name, name) for name in EXPORT_CONTENT_TYPES],
+        required=False)
+    gzip = forms.BooleanField(required=False)
+    category = forms.SlugField(required=False)
+    author = forms.CharField(required=False)
+    since = forms.DateField(required=False)
+    until = forms.DateField(required=False)
+
+    def clean_format(self):
+        return self.cleaned_data['format'] or 'jsonl'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        since, until = cleaned_data.get('since'), cleaned_data.get('until')
+        if since and until and since > until:
+            raise forms.ValidationError(
+                'Начало периода не может быть позже его конца.')
+        return cleaned_data
@@ -0,0 +1,258 @@
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import get_page_cache_tags, invalidate_pages
+from .models import ImageStatus, Post
+
+logger = logging.getLogger(__name__)
+
+SAVE_OPTIONS = {
+    'JPEG': {'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'method': 4},
+}
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp', 'AVIF': 'avif'}
+
+
+def get_modern_formats():
+    Image.init()
+    return [
+        image_format for image_format in settings.POST_IMAGE_FORMATS
+        if image_format in Image.SAVE
+    ]
+
+
+def get_mime_type(image_format):
+    return Image.MIME.get(image_format, f'image/{image_format.lower()}')
+
+
+def get_variant_name(name, width, image_format):
+    root, ext = posixpath.splitext(name)
+    ext = EXTENSIONS.get(image_format, ext.lstrip('.'))
+    return f'{root}.{width}w.{ext}'
+
+
+def get_variant_names(variants):
+    names = {
+        name
+        for files in (variants.get('fallback', []),
+                      *variants.get('sources', {}).values())
+        for _, name in files
+    }
+    names.discard(variants.get('source'))
+    return names
+
+
+def _encode(image, image_format):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(
+        buffer, image_format, quality=settings.POST_IMAGE_QUALITY,
+        **SAVE_OPTIONS.get(image_format, {}))
+    return buffer.getvalue()
+
+
+def delete_variants(storage, names):
+    for name in names:
+        if storage.exists(name):
+            storage.delete(name)
+
+
+def _save_variant(storage, name, image, image_format):
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(_encode(image, image_format)))
+
+
+def make_variants(field_file):
+    storage = field_file.storage
+    with field_file.open('rb'), Image.open(field_file) as original:
+        source_format = original.format
+        image = ImageOps.exif_transpose(original)
+    if image.mode in ('P', 'LA', 'PA'):
+        image = image.convert('RGBA')
+    elif image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGB')
+    widths = sorted({
+        min(width, image.width) for width in settings.POST_IMAGE_WIDTHS})
+    variants = {
+        'source': field_file.name,
+        'width': image.width,
+        'height': image.height,
+        'fallback': [],
+        'sources': {},
+    }
+    modern_formats = get_modern_formats()
+    for width in widths:
+        resized = image
+        if width < image.width:
+            resized = image.copy()
+            resized.thumbnail((width, image.height), Image.Resampling.LANCZOS)
+        for image_format in modern_formats:
+            name = get_variant_name(field_file.name, width, image_format)
+            variants['sources'].setdefault(
+                get_mime_type(image_format), []
+            ).append([width, _save_variant(
+                storage, name, resized, image_format)])
+        if width == image.width:
+            variants['fallback'].append([width, field_file.name])
+        else:
+            name = get_variant_name(field_file.name, width, source_format)
+            variants['fallback'].append([width, _save_variant(
+                storage, name, resized, source_format)])
+    return variants
+
+
+def process_post_image(post_id, force=False):
+    post = Post.objects.filter(pk=post_id).only('image', 'image_variants')
+    post = post.first()
+    if post is None:
+        return None
+    if not post.image:
+        variants = {}
+    elif not force and not needs_processing(post):
+        variants = post.image_variants
+    else:
+        variants = make_variants(post.image)
+    updated = Post.objects.filter(pk=post_id, image=post.image.name).update(
+        image_variants=variants,
+        image_status=ImageStatus.READY if post.image else '',
+        updated_at=timezone.now())
+    storage = post.image.storage
+    if not updated:
+        # The image was replaced while this one was being resized.
+        delete_variants(storage, get_variant_names(variants))
+        return None
+    delete_variants(
+        storage,
+        get_variant_names(post.image_variants) - get_variant_names(variants))
+    if settings.PAGE_CACHE_ENABLED:
+        invalidate_pages(get_page_cache_tags(post))
+    return variants
+
+
+def needs_processing(post):
+    if post.image:
+        return post.image_variants.get('source') != post.image.name
+    return bool(post.image_variants)
+
+
+def claim_image_job(post_id):
+    return Post.objects.filter(
+        pk=post_id,
+        image_status__in=(ImageStatus.PENDING, ImageStatus.FAILED),
+        image_attempts__lt=settings.IMAGE_PROCESSING_MAX_ATTEMPTS,
+    ).update(
+        image_status=ImageStatus.PROCESSING,
+        image_attempts=F('image_attempts') + 1)
+
+
+def run_image_job(post_id, force=False, retry=True):
+    while claim_image_job(post_id):
+        try:
+            variants = process_post_image(post_id, force=force)
+        except Exception:
+            logger.exception(
+                'Не удалось обработать изображение публикации %s', post_id)
+            Post.objects.filter(pk=post_id).update(
+                image_status=ImageStatus.FAILED)
+            if retry:
+                image_pool.retry_later(post_id)
+            return False
+        if variants is not None:
+            return True
+        Post.objects.filter(
+            pk=post_id, image_status=ImageStatus.PROCESSING
+        ).update(image_status=ImageStatus.PENDING, image_attempts=0)
+    return False
+
+
+def schedule_image_processing(post, created=False):
+    if not post.image:
+        process_post_image(post.pk)
+        return
+    posts = Post.objects.filter(pk=post.pk)
+    if not created:
+        posts = posts.exclude(image_status=ImageStatus.PROCESSING)
+    posts.update(image_status=ImageStatus.PENDING, image_attempts=0)
+    transaction.on_commit(lambda: image_pool.submit(post.pk))
+
+
+class ImageProcessingPool:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._timers = set()
+
+    def _start(self):
+        with self._lock:
+            if self._executor is None:
+                workers = settings.IMAGE_PROCESSING_WORKERS
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix='post-images')
+                self._slots = threading.BoundedSemaphore(
+                    workers + settings.IMAGE_PROCESSING_QUEUE_SIZE)
+        return self._executor, self._slots
+
+    def submit(self, post_id):
+        if not settings.IMAGE_PROCESSING_WORKERS:
+            run_image_job(post_id, retry=False)
+            return True
+        executor, slots = self._start()
+        if not slots.acquire(blocking=False):
+            logger.warning(
+                'Очередь обработки изображений заполнена, публикация %s'
+                ' обработается командой process_images', post_id)
+            return False
+        future = executor.submit(self._run, post_id)
+        future.add_done_callback(lambda future: slots.release())
+        return True
+
+    def _run(self, post_id):
+        try:
+            run_image_job(post_id)
+        finally:
+            connection.close()
+
+    def retry_later(self, post_id):
+        if not settings.IMAGE_PROCESSING_WORKERS:
+            return
+        attempts = Post.objects.filter(pk=post_id).values_list(
+            'image_attempts', flat=True).first() or 0
+        timer = threading.Timer(
+            settings.IMAGE_PROCESSING_RETRY_DELAY * 2 ** attempts,
+            self._retry, (post_id,))
+        timer.daemon = True
+        with self._lock:
+            self._timers.add(timer)
+        timer.start()
+
+    def _retry(self, post_id):
+        with self._lock:
+            self._timers.discard(threading.current_thread())
+        self.submit(post_id)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor, self._slots = self._executor, None, None
+            timers, self._timers = self._timers, set()
+        for timer in timers:
+            timer.cancel()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+image_pool = ImageProcessingPool()
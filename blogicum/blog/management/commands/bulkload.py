@@ -0,0 +1,211 @@
+import gzip
+import json
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from blog.cache import invalidate_feeds, invalidate_pages, invalidate_sitemaps
+from blog.models import Category, Post
+from blog.paginator import invalidate_counts
+from blog.queryset import get_actual_comment_count
+from blog.search import rebuild_search_index
+
+LOAD_ORDER = (
+    'blog.category',
+    'blog.location',
+    settings.AUTH_USER_MODEL.lower(),
+    'blog.post',
+    'blog.comment',
+)
+READ_CHUNK_SIZE = 2 ** 16
+
+
+def _read_more(stream, buffer, position, chunk_size):
+    chunk = stream.read(chunk_size)
+    if not chunk:
+        raise CommandError(
+            'Фикстура оборвалась или содержит некорректный JSON.')
+    return buffer[position:] + chunk, 0
+
+
+def _skip_whitespace(stream, buffer, position, chunk_size):
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position < len(buffer):
+            return buffer, position
+        buffer, position = _read_more(stream, buffer, position, chunk_size)
+
+
+def iter_fixture(stream, chunk_size=READ_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer, position = _skip_whitespace(stream, '', 0, chunk_size)
+    if buffer[position] != '[':
+        raise CommandError('Фикстура должна быть списком объектов.')
+    position += 1
+    first = True
+    while True:
+        buffer, position = _skip_whitespace(
+            stream, buffer, position, chunk_size)
+        if buffer[position] == ']':
+            return
+        if not first:
+            if buffer[position] != ',':
+                raise CommandError(
+                    f'Ожидалась запятая, найдено {buffer[position]!r}.')
+            buffer, position = _skip_whitespace(
+                stream, buffer, position + 1, chunk_size)
+        first = False
+        while True:
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError:
+                buffer, position = _read_more(
+                    stream, buffer, position, chunk_size)
+        yield obj
+        buffer, position = buffer[position:], 0
+
+
+def get_timestamp_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+
+
+@contextmanager
+def raw_timestamps(models):
+    saved = [
+        (field, field.auto_now, field.auto_now_add)
+        for model in models for field in get_timestamp_fields(model)
+    ]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает фикстуру JSON в формате dumpdata: читает файл '
+        'потоком и вставляет объекты пачками через bulk_create, без '
+        'сигналов на каждую строку. Счётчики комментариев и поисковый '
+        'индекс перестраиваются один раз в конце.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixture', help='Путь к фикстуре (.json или .json.gz).')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Число объектов в одной вставке.')
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать объекты, которые уже есть в базе.')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.models = {label: apps.get_model(label) for label in LOAD_ORDER}
+        self.timestamp_fields = {
+            label: [field.attname for field in get_timestamp_fields(model)]
+            for label, model in self.models.items()
+        }
+        self.buffers = {label: [] for label in LOAD_ORDER}
+        self.loaded = dict.fromkeys(LOAD_ORDER, 0)
+        self.skipped = {}
+        self.m2m = []
+        self.category_ids = set()
+        self.now = timezone.now()
+        started = time.perf_counter()
+
+        opener = gzip.open if options['fixture'].endswith('.gz') else open
+        try:
+            with opener(options['fixture'], 'rt', encoding='utf-8') as stream:
+                with transaction.atomic(), raw_timestamps(
+                        self.models.values()):
+                    self.load(stream)
+                    self.finish()
+        except OSError as error:
+            raise CommandError(error)
+
+        elapsed = time.perf_counter() - started
+        total = sum(self.loaded.values())
+        for label, count in self.loaded.items():
+            self.stdout.write(f'{label}: {count}')
+        for label, count in self.skipped.items():
+            self.stdout.write(f'{label}: {count} (пропущено)')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-9):.0f} строк/с).'))
+
+    def load(self, stream):
+        for obj in serializers.deserialize(
+                'python', self.known_objects(stream), ignorenonexistent=True):
+            label = obj.object._meta.label_lower
+            self.prepare(obj.object)
+            if obj.m2m_data and any(obj.m2m_data.values()):
+                self.m2m.append((obj.object, obj.m2m_data))
+            self.buffers[label].append(obj.object)
+            if len(self.buffers[label]) >= self.batch_size:
+                self.flush(upto=label)
+
+    def known_objects(self, stream):
+        for data in iter_fixture(stream):
+            label = data.get('model', '').lower()
+            if label in self.buffers:
+                yield data
+            else:
+                self.skipped[label] = self.skipped.get(label, 0) + 1
+
+    def prepare(self, instance):
+        for attname in self.timestamp_fields[instance._meta.label_lower]:
+            if getattr(instance, attname) is None:
+                setattr(instance, attname, self.now)
+        if isinstance(instance, Post):
+            self.category_ids.add(instance.category_id)
+        elif isinstance(instance, Category):
+            self.category_ids.add(instance.pk)
+
+    def flush(self, upto=LOAD_ORDER[-1]):
+        for label in LOAD_ORDER[:LOAD_ORDER.index(upto) + 1]:
+            objects = self.buffers[label]
+            if objects:
+                self.models[label].objects.bulk_create(
+                    objects, batch_size=self.batch_size,
+                    ignore_conflicts=self.ignore_conflicts)
+                self.loaded[label] += len(objects)
+                self.buffers[label] = []
+
+    def finish(self):
+        self.flush()
+        for instance, m2m_data in self.m2m:
+            for name, values in m2m_data.items():
+                getattr(instance, name).set(values)
+        connection = connections[DEFAULT_DB_ALIAS]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), self.models.values()):
+                cursor.execute(sql)
+        Post.objects.update(comment_count=get_actual_comment_count())
+        rebuild_search_index()
+        invalidate_counts()
+        invalidate_feeds()
+        invalidate_sitemaps()
+        if settings.PAGE_CACHE_ENABLED:
+            slugs = Category.objects.filter(
+                pk__in=self.category_ids).values_list('slug', flat=True)
+            invalidate_pages(
+                {'index', *(f'category:{slug}' for slug in slugs)})
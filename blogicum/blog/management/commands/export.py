@@ -0,0 +1,50 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.export import EXPORT_CONTENT_TYPES, EXPORT_FIELDS, iter_export
+from blog.forms import ExportForm
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает публикации или комментарии в JSONL или CSV. '
+        'Строки читаются из базы порциями, поэтому расход памяти не '
+        'зависит от объёма выгрузки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=tuple(EXPORT_FIELDS))
+        parser.add_argument(
+            '--format', choices=tuple(EXPORT_CONTENT_TYPES), default='jsonl')
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжать выгрузку gzip.')
+        parser.add_argument(
+            '--output', '-o', default='-',
+            help='Файл для выгрузки; по умолчанию — стандартный вывод.')
+        parser.add_argument('--category', help='Слаг категории.')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument('--since', help='Начальная дата, ГГГГ-ММ-ДД.')
+        parser.add_argument('--until', help='Конечная дата, ГГГГ-ММ-ДД.')
+
+    def handle(self, *args, **options):
+        form = ExportForm({
+            name: options[name]
+            for name in ExportForm.base_fields if options[name] is not None
+        })
+        if not form.is_valid():
+            raise CommandError(form.errors.as_text())
+
+        if options['output'] == '-':
+            self.write(sys.stdout.buffer, options['kind'], form.cleaned_data)
+            return
+        try:
+            with open(options['output'], 'wb') as output:
+                self.write(output, options['kind'], form.cleaned_data)
+        except OSError as error:
+            raise CommandError(error)
+
+    def write(self, output, kind, options):
+        for chunk in iter_export(kind, **options):
+            output.write(chunk)
+        output.flush()
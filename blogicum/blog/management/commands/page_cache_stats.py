@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import get_page_cache_stats, reset_page_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает число попаданий и промахов кэша страниц. Счётчики '
+        'хранятся в кэше PAGE_CACHE_STATS_CACHE, который должен быть общим '
+        'для всех процессов сайта.'
+    )
+    # Only reads the counters; the site need not pass system checks.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Обнулить счётчики после вывода.')
+
+    def handle(self, *args, **options):
+        stats = get_page_cache_stats()
+        total = sum(stats.values())
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f'Попаданий: {stats["hits"]}, промахов: {stats["misses"]}, '
+            f'доля попаданий: {ratio:.1%}')
+        if options['reset']:
+            reset_page_cache_stats()
@@ -0,0 +1,61 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.images import run_image_job
+from blog.models import ImageStatus, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии изображений публикаций, которые ещё не '
+        'обработаны или не обработались из-за ошибки. Изображения '
+        'обрабатываются параллельно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Число потоков обработки.')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать копии у всех изображений.')
+
+    def handle(self, *args, **options):
+        self.force = options['force']
+        posts = Post.objects.exclude(image='')
+        if not self.force:
+            posts = posts.exclude(image_status=ImageStatus.READY)
+        post_ids = list(posts.values_list('id', flat=True))
+        Post.objects.filter(pk__in=post_ids).update(
+            image_status=ImageStatus.PENDING, image_attempts=0)
+
+        started = time.perf_counter()
+        workers = max(options['workers'], 1)
+        if workers == 1:
+            results = [self.process(post_id) for post_id in post_ids]
+        else:
+            results = []
+            ids = iter(post_ids)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                while batch := list(islice(ids, workers * 4)):
+                    results += executor.map(self.process_in_thread, batch)
+        failed = results.count(False)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {len(results) - failed} '
+            f'за {elapsed:.1f} с.'))
+        if failed:
+            self.stderr.write(f'Не удалось обработать: {failed}.')
+
+    def process(self, post_id):
+        return run_image_job(post_id, force=self.force, retry=False)
+
+    def process_in_thread(self, post_id):
+        try:
+            return self.process(post_id)
+        finally:
+            connection.close()
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from blog.models import Post
+from blog.queryset import get_actual_comment_count
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает и проверяет счётчики комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Только проверить счётчики, ничего не изменяя.')
+
+    def handle(self, *args, **options):
+        mismatched = (
+            Post.objects.annotate(actual_count=get_actual_comment_count())
+            .exclude(comment_count=F('actual_count'))
+        )
+        if options['check']:
+            count = mismatched.count()
+            if count:
+                raise CommandError(
+                    f'Счётчик комментариев расходится у {count} публикаций.')
+            self.stdout.write(self.style.SUCCESS('Счётчики в порядке.'))
+            return
+        updated = Post.objects.filter(
+            pk__in=mismatched.values('pk')
+        ).update(comment_count=get_actual_comment_count())
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено публикаций: {updated}.'))
@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в реплики из DATABASE_REPLICAS. '
+        'Нужна для локальной проверки чтения с реплик; на других СУБД '
+        'используйте их собственную репликацию.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            help='Повторять копирование каждые N секунд.')
+
+    def handle(self, *args, **options):
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('Копирование поддерживается только для SQLite.')
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError(
+                'В DATABASE_REPLICAS не указано ни одной реплики.')
+        while True:
+            started = time.perf_counter()
+            for alias in settings.DATABASE_REPLICAS:
+                self.copy(primary, connections[alias])
+            self.stdout.write(self.style.SUCCESS(
+                f'Реплики обновлены за '
+                f'{time.perf_counter() - started:.2f} с.'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def copy(self, primary, replica):
+        primary.ensure_connection()
+        replica.close()
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            # The backup API copies a consistent snapshot even while the
+            # primary is being written to.
+            primary.connection.backup(target)
+        finally:
+            target.close()
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+SEARCH_TABLE = 'blog_post_fts'
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(title, text,'
+        " tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+    schema_editor.execute(
+        f'INSERT INTO {SEARCH_TABLE} (rowid, title, text)'
+        ' SELECT id, title, text FROM blog_post')
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:58
+
+from django.db import migrations, models
+
+
+def fill_image_status(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.exclude(image='')
+    posts.update(image_status='pending')
+    for post in posts.only('image', 'image_variants').iterator():
+        if post.image_variants.get('source') == post.image.name:
+            Post.objects.filter(pk=post.pk).update(image_status='ready')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_attempts',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Попытки обработки изображения'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Ожидает обработки'), ('processing', 'Обрабатывается'), ('ready', 'Готово'), ('failed', 'Ошибка')], editable=False, max_length=16, verbose_name='Обработка изображения'),
+        ),
+        migrations.RunPython(fill_image_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.core.files.storage import default_storage
+from django.db import migrations
+
+
+def reset_legacy_variants(apps, schema_editor):
+    # Variants made before srcset support are keyed by usage ("card",
+    # "detail"); drop them so process_images builds the new set.
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.exclude(image='').only('image_variants')
+    for post in posts.iterator():
+        variants = post.image_variants
+        if not variants or 'fallback' in variants:
+            continue
+        for key, name in variants.items():
+            if key != 'source' and default_storage.exists(name):
+                default_storage.delete(name)
+        Post.objects.filter(pk=post.pk).update(
+            image_variants={}, image_status='pending', image_attempts=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_image_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_legacy_variants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_image_srcset'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='category',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='blog.category', verbose_name='Категория'),
+        ),
+    ]
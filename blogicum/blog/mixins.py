@@ -1,17 +1,45 @@
-from django.shortcuts import get_object_or_404, redirect
-from django.shortcuts import get_object_or_404
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, JsonResponse
+from django.shortcuts import redirect
+from django.template.response import SimpleTemplateResponse
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 
+from .api import (InvalidQuery, paginate_api_rows, parse_fields, parse_limit,
+                  serialize_rows)
+from .cache import count_page_cache, get_page_cache_key
+from .executors import db_executor, render_executor
 from .forms import PostForm
 from .models import Comment, Post
+from .paginator import (CachedCountPaginator, InvalidCursor, encode_cursor,
+                        get_counts_changed_at, get_counts_version,
+                        paginate_by_keyset)
+from .queryset import get_posts_last_modified, get_publication_cutoff
+
+
+class CachedObjectMixin:
 
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
 
-class PostMixin:
+
+class PostMixin(CachedObjectMixin):
     model = Post
     form_class = PostForm
     pk_url_kwarg = 'post_id'
     template_name = 'blog/create.html'
 
+    def get_queryset(self):
+        return Post.objects.select_related('author', 'location')
+
     def dispatch(self, request, *args, **kwargs):
         instance = self.get_object()
         if instance.author != request.user:
@@ -19,16 +47,16 @@ class PostMixin:
         return super().dispatch(request, *args, **kwargs)
 
 
-class CommentMixin:
+class CommentMixin(CachedObjectMixin):
     model = Comment
     pk_url_kwarg = 'comment_id'
 
+    def get_queryset(self):
+        return Comment.objects.select_related('author').filter(
+            post_id=self.kwargs['post_id'])
+
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(
-            Comment,
-            pk=self.kwargs[self.pk_url_kwarg],
-            post__id=self.kwargs['post_id']
-        )
+        instance = self.get_object()
         if instance.author != request.user:
             return redirect('blog:post_detail', post_id=instance.post_id)
 
@@ -37,6 +65,185 @@ class CommentMixin:
     def get_success_url(self):
         return reverse(
             'blog:post_detail', kwargs={
-                'post_id': self.kwargs[self.pk_url_kwarg]
+                'post_id': self.kwargs['post_id']
             }
         )
+
+
+class PostsPaginationMixin:
+    paginator_class = CachedCountPaginator
+    after_kwarg = 'after'
+    before_kwarg = 'before'
+
+    def get_count_cache_key(self):
+        cutoff = int(get_publication_cutoff().timestamp())
+        return ':'.join(
+            [self.request.resolver_match.view_name,
+             *map(str, self.kwargs.values()), str(cutoff)]
+        )
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            cache_key=self.get_count_cache_key(), **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        after = self.request.GET.get(self.after_kwarg)
+        before = self.request.GET.get(self.before_kwarg)
+        if after is None and before is None:
+            paginator, page, object_list, is_paginated = (
+                super().paginate_queryset(queryset, page_size))
+            if page.object_list:
+                page.previous_cursor = encode_cursor(page[0])
+                page.next_cursor = encode_cursor(page[-1])
+            return paginator, page, object_list, is_paginated
+        try:
+            page = paginate_by_keyset(
+                queryset, page_size, after=after, before=before)
+        except InvalidCursor:
+            raise Http404('Страница не существует')
+        return None, page, page.object_list, page.has_other_pages()
+
+
+class AnonymousPageCacheMixin:
+    page_cache_tags = ()
+
+    def get_page_cache_tags(self):
+        return [tag.format(**self.kwargs) for tag in self.page_cache_tags]
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+                not settings.PAGE_CACHE_ENABLED
+                or request.method != 'GET'
+                or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        key = get_page_cache_key(request, self.get_page_cache_tags())
+        response = cache.get(key)
+        if response is not None:
+            count_page_cache('hits')
+            response['X-Page-Cache'] = 'HIT'
+            return response
+        count_page_cache('misses')
+        response = super().dispatch(request, *args, **kwargs)
+        response['X-Page-Cache'] = 'MISS'
+        if response.status_code == 200:
+            timeout = settings.PAGE_CACHE_TIMEOUT
+            if getattr(response, 'is_rendered', True):
+                cache.set(key, response, timeout)
+            else:
+                response.add_post_render_callback(
+                    lambda rendered: cache.set(key, rendered, timeout))
+        return response
+
+
+class ConditionalGetMixin:
+
+    def get_last_modified(self):
+        last_modified = get_posts_last_modified()
+        if last_modified is None:
+            return None
+        return max(last_modified, get_counts_changed_at())
+
+    def get_etag_extra(self):
+        return (get_counts_version(),)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return super().dispatch(request, *args, **kwargs)
+        state = (
+            request.get_full_path(), request.user.pk,
+            last_modified.isoformat(), *self.get_etag_extra()
+        )
+        etag = quote_etag(hashlib.md5(repr(state).encode()).hexdigest())
+        timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class AsyncViewMixin:
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            response = await db_executor.run(view, request, *args, **kwargs)
+            if (isinstance(response, SimpleTemplateResponse)
+                    and not response.is_rendered):
+                await render_executor.run(response.render)
+            return response
+
+        async_view.view_class = view.view_class
+        async_view.view_initkwargs = view.view_initkwargs
+        return async_view
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # The page is loaded here, on the database executor, so that
+        # rendering never touches the database.
+        page = context.get('page_obj')
+        if page is not None:
+            page.object_list = list(page.object_list)
+        return context
+
+
+class ApiMixin:
+    api_kind = None
+
+    def get_fields(self):
+        return parse_fields(self.api_kind, self.request.GET.get('fields'))
+
+    def render_json(self, data, status=200):
+        return JsonResponse(
+            data, status=status, json_dumps_params={'ensure_ascii': False})
+
+    def render_error(self, message, status=400):
+        return self.render_json({'error': message}, status=status)
+
+
+class ApiListMixin(ApiMixin):
+    key_field = 'pub_date'
+    ascending = False
+
+    def get_page_url(self, **params):
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query.update(params)
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{query.urlencode()}')
+
+    def get(self, request, *args, **kwargs):
+        try:
+            fields = self.get_fields()
+            page = paginate_api_rows(
+                self.get_queryset(), self.api_kind, fields,
+                parse_limit(request.GET.get('limit')),
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+                key_field=self.key_field, ascending=self.ascending)
+        except InvalidQuery as error:
+            return self.render_error(str(error))
+        except InvalidCursor:
+            return self.render_error('Неверный курсор страницы.')
+        return self.render_json({
+            'results': serialize_rows(page, self.api_kind, fields),
+            'next': (
+                self.get_page_url(after=page.next_cursor)
+                if page.has_next() else None),
+            'previous': (
+                self.get_page_url(before=page.previous_cursor)
+                if page.has_previous() else None),
+        })
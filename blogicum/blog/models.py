@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
 
@@ -13,6 +14,8 @@ class PublishedModels(models.Model):
     )
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name='Добавлено')
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name='Изменено')
 
     class Meta:
         abstract = True
@@ -50,6 +53,13 @@ class Category(PublishedModels):
         verbose_name_plural = 'Категории'
 
 
+class ImageStatus(models.TextChoices):
+    PENDING = 'pending', 'Ожидает обработки'
+    PROCESSING = 'processing', 'Обрабатывается'
+    READY = 'ready', 'Готово'
+    FAILED = 'failed', 'Ошибка'
+
+
 class Post(PublishedModels):
     title = models.CharField(
         max_length=MAX_TITLE_LENGTH, verbose_name='Заголовок')
@@ -61,7 +71,7 @@ class Post(PublishedModels):
             '— можно делать отложенные публикации.')
     )
     author = models.ForeignKey(
-        User, on_delete=models.CASCADE,
+        User, on_delete=models.CASCADE, db_index=False,
         verbose_name='Автор публикации')
     location = models.ForeignKey(
         Location, on_delete=models.SET_NULL,
@@ -75,12 +85,71 @@ class Post(PublishedModels):
         upload_to='posts_images',
         blank=True
     )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False,
+        verbose_name='Количество комментариев')
+    image_variants = models.JSONField(
+        default=dict, editable=False,
+        verbose_name='Уменьшенные копии изображения')
+    image_status = models.CharField(
+        max_length=16, choices=ImageStatus.choices, blank=True,
+        editable=False, verbose_name='Обработка изображения')
+    image_attempts = models.PositiveSmallIntegerField(
+        default=0, editable=False,
+        verbose_name='Попытки обработки изображения')
+
+    derived_fields = (
+        'comment_count', 'image_variants', 'image_status', 'image_attempts')
+
+    def save(self, *args, **kwargs):
+        # Derived fields are written only by queryset updates (comment
+        # signals, the image pool), so a plain save() of a loaded post skips
+        # them and a stale copy cannot overwrite them. Name them in
+        # update_fields to save them explicitly.
+        if (
+                not self._state.adding and self.pk is not None
+                and kwargs.get('update_fields') is None
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.derived_fields
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def image_is_processing(self):
+        return self.image_status in (
+            ImageStatus.PENDING, ImageStatus.PROCESSING)
+
+    def get_image_url(self, variant):
+        files = self.image_variants.get('fallback')
+        if not files:
+            return self.image.url
+        max_width = settings.POST_IMAGE_VARIANTS[variant]
+        _, name = max(
+            (file for file in files if file[0] <= max_width),
+            default=files[0])
+        return self.image.storage.url(name)
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_published_pub_date_idx'),
+            models.Index(
+                fields=('category', 'pub_date'),
+                condition=models.Q(is_published=True),
+                name='post_category_pub_date_idx'),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'),
+        )
 
 
 class Comment(models.Model):
@@ -89,6 +158,7 @@ class Comment(models.Model):
         Post,
         on_delete=models.CASCADE,
         null=True,
+        db_index=False,
     )
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name='Добавлено')
@@ -99,3 +169,8 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'),
+        )
@@ -0,0 +1,154 @@
+import base64
+import time
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+COUNTS_VERSION_KEY = 'paginator:counts_version'
+MAX_CURSOR_PK = 2 ** 63 - 1
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(obj, key_field='pub_date'):
+    if isinstance(obj, dict):
+        value, pk = obj[key_field], obj['id']
+    else:
+        value, pk = getattr(obj, key_field), obj.pk
+    raw = f'{value.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        pub_date, pk = raw.decode().split('|')
+        pub_date, pk = datetime.fromisoformat(pub_date), int(pk)
+    except (ValueError, UnicodeDecodeError) as error:
+        raise InvalidCursor(token) from error
+    # Larger ids overflow the database integer and cannot match a row.
+    if not 1 <= pk <= MAX_CURSOR_PK:
+        raise InvalidCursor(token)
+    return pub_date, pk
+
+
+class KeysetPage(Sequence):
+    is_keyset = True
+
+    def __init__(self, object_list, has_previous, has_next,
+                 key_field='pub_date'):
+        self.object_list = object_list
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.key_field = key_field
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self)} objects>'
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    @property
+    def previous_cursor(self):
+        if self.object_list:
+            return encode_cursor(self.object_list[0], self.key_field)
+
+    @property
+    def next_cursor(self):
+        if self.object_list:
+            return encode_cursor(self.object_list[-1], self.key_field)
+
+
+def _get_keyset_ordering(key_field, ascending):
+    if ascending:
+        return key_field, 'id'
+    return f'-{key_field}', '-id'
+
+
+def _seek(queryset, key_field, token, ascending):
+    value, pk = decode_cursor(token)
+    if ascending:
+        return queryset.filter(**{f'{key_field}__gte': value}).exclude(
+            **{key_field: value, 'id__lte': pk})
+    return queryset.filter(**{f'{key_field}__lte': value}).exclude(
+        **{key_field: value, 'id__gte': pk})
+
+
+def paginate_by_keyset(queryset, per_page, after=None, before=None,
+                       key_field='pub_date', ascending=False):
+    if before is not None:
+        rows = list(
+            _seek(queryset, key_field, before, not ascending)
+            .order_by(*_get_keyset_ordering(key_field, not ascending))
+            [:per_page + 1]
+        )
+        return KeysetPage(
+            rows[:per_page][::-1], len(rows) > per_page, True, key_field)
+    queryset = queryset.order_by(*_get_keyset_ordering(key_field, ascending))
+    if after is not None:
+        queryset = _seek(queryset, key_field, after, ascending)
+    rows = list(queryset[:per_page + 1])
+    return KeysetPage(
+        rows[:per_page], after is not None, len(rows) > per_page, key_field)
+
+
+def get_counts_version():
+    version = cache.get(COUNTS_VERSION_KEY)
+    if version is None:
+        cache.add(COUNTS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(COUNTS_VERSION_KEY)
+    return version
+
+
+def get_counts_changed_at():
+    return datetime.fromtimestamp(get_counts_version() / 1e9, tz=timezone.utc)
+
+
+def invalidate_counts():
+    # The version is the time of the last change, so deletes and
+    # unpublishing, which leave no newer updated_at behind, still move
+    # Last-Modified of the lists.
+    cache.set(COUNTS_VERSION_KEY, time.time_ns(), None)
+
+
+class CachedCountPaginator(Paginator):
+
+    def __init__(self, *args, cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        key = f'paginator:count:{get_counts_version()}:{self.cache_key}'
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, settings.PAGINATOR_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def page(self, number):
+        page = super().page(number)
+        page.elided_page_range = list(
+            self.get_elided_page_range(page.number))
+        return page
@@ -1,21 +1,104 @@
-from django.db.models import Count
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Count, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .models import Post
+from .models import Category, Comment, Location, Post
+
+
+def get_publication_cutoff():
+    now = timezone.now()
+    bucket = settings.PUBLICATION_CUTOFF_BUCKET
+    if not bucket:
+        return now
+    return datetime.fromtimestamp(
+        now.timestamp() // bucket * bucket, tz=timezone.utc)
 
 
 def get_posts_queryset(
         manager=Post.objects,
-        apply_filters=False,
-        apply_annotation=False
+        apply_filters=False
 ):
     queryset = manager.select_related('author', 'location', 'category')
     if apply_filters:
         queryset = queryset.filter(
             is_published=True,
-            pub_date__lt=timezone.now(),
+            pub_date__lt=get_publication_cutoff(),
             category__is_published=True
         )
-    if apply_annotation:
-        queryset = queryset.annotate(comment_count=Count('comments'))
-    return queryset.order_by('-pub_date')
+    return queryset.order_by('-pub_date', '-id')
+
+
+def get_next_publication(queryset=Post.objects):
+    return queryset.filter(
+        is_published=True,
+        pub_date__gte=get_publication_cutoff(),
+        category__is_published=True
+    ).aggregate(next=Min('pub_date'))['next']
+
+
+def get_actual_comment_count():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0
+    )
+
+
+def get_visibility_filter(user):
+    published = Q(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lt=get_publication_cutoff()
+    )
+    if user.is_authenticated:
+        return published | Q(author=user)
+    return published
+
+
+def _latest(queryset, field):
+    return Subquery(queryset.order_by(f'-{field}').values(field)[:1])
+
+
+def get_post_state(post_id, user):
+    row = (
+        Post.objects.filter(get_visibility_filter(user), pk=post_id)
+        .values_list('updated_at', 'category__updated_at',
+                     'location__updated_at', 'category__slug', 'location_id')
+        .first()
+    )
+    if row is None:
+        return None
+    return {
+        'last_modified': max(value for value in row[:3] if value is not None),
+        'category_slug': row[3],
+        'location_id': row[4],
+    }
+
+
+def get_posts_last_modified():
+    row = (
+        Post.objects.order_by('-updated_at')
+        .values_list('updated_at')
+        .annotate(
+            category_updated_at=_latest(Category.objects, 'updated_at'),
+            location_updated_at=_latest(Location.objects, 'updated_at'),
+            published_at=_latest(
+                Post.objects.filter(
+                    is_published=True,
+                    pub_date__lt=get_publication_cutoff()
+                ),
+                'pub_date'
+            )
+        )
+        .first()
+    )
+    if row is not None:
+        return max(value for value in row if value is not None)
@@ -0,0 +1,97 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+SEARCH_TABLE = 'blog_post_fts'
+# bm25 weights for (title, text): a match in the title ranks higher.
+SEARCH_RANK = f'bm25({SEARCH_TABLE}, 10.0, 1.0)'
+SNIPPET_TOKENS = 24
+MARK_START, MARK_END = '\x02', '\x03'
+WORD_RE = re.compile(r'\w+')
+
+
+def is_search_supported():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    words = WORD_RE.findall(text.lower())
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _highlighted(value):
+    return mark_safe(
+        escape(value)
+        .replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+def search_posts(queryset, text):
+    match = build_match_query(text)
+    if not match:
+        return queryset.none()
+    if not is_search_supported():
+        return queryset.filter(
+            Q(title__icontains=text) | Q(text__icontains=text))
+    marks = f"'{MARK_START}', '{MARK_END}'"
+    return queryset.extra(
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = {Post._meta.db_table}.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match],
+        select={
+            'rank': SEARCH_RANK,
+            'title_highlight': f'highlight({SEARCH_TABLE}, 0, {marks})',
+            'text_snippet': (
+                f"snippet({SEARCH_TABLE}, 1, {marks}, '…', {SNIPPET_TOKENS})"
+            ),
+        },
+    ).order_by('rank', '-pub_date')
+
+
+def highlight_results(posts):
+    for post in posts:
+        post.title_highlight = _highlighted(
+            getattr(post, 'title_highlight', post.title))
+        post.text_snippet = _highlighted(
+            getattr(post, 'text_snippet', post.text))
+    return posts
+
+
+def index_post(post):
+    if not is_search_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text)'
+            ' VALUES (%s, %s, %s)', [post.pk, post.title, post.text])
+
+
+def unindex_post(post_id):
+    if not is_search_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_search_index():
+    if not is_search_supported():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text)'
+            f' SELECT id, title, text FROM {Post._meta.db_table}')
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+        cursor.execute(f'SELECT count(*) FROM {SEARCH_TABLE}')
+        return cursor.fetchone()[0]
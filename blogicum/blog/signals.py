@@ -0,0 +1,172 @@
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import (get_page_cache_tags, invalidate_feeds, invalidate_pages,
+                    invalidate_sitemaps)
+from .database import apply_pragmas
+from .images import (delete_variants, get_variant_names, needs_processing,
+                     image_pool, schedule_image_processing)
+from .models import Category, Comment, Location, Post, User
+from .paginator import invalidate_counts
+from .queryset import get_actual_comment_count
+from .search import index_post, unindex_post
+
+
+@receiver(post_save, sender=Comment)
+def touch_post_on_comment_save(sender, instance, created, raw=False,
+                               **kwargs):
+    if raw or not instance.post_id:
+        return
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+def _schedule_comment_recount(post_id):
+    # Comments removed by one delete, cascades included, share a single
+    # recount that runs once their transaction commits. A rollback discards
+    # it together with the callback.
+    connection = transaction.get_connection()
+    recount = getattr(connection, 'comment_recount', None)
+    if recount is None or not any(
+            func is recount for _, func in connection.run_on_commit):
+        post_ids = set()
+
+        def recount():
+            if connection.comment_recount is recount:
+                connection.comment_recount = None
+            Post.objects.filter(pk__in=post_ids).update(
+                comment_count=get_actual_comment_count(),
+                updated_at=timezone.now())
+
+        recount.post_ids = post_ids
+        connection.comment_recount = recount
+        post_ids.add(post_id)
+        transaction.on_commit(recount)
+    else:
+        recount.post_ids.add(post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def recount_comments_on_delete(sender, instance, **kwargs):
+    if instance.post_id:
+        _schedule_comment_recount(instance.post_id)
+
+
+@receiver(post_save, sender=Post)
+def index_post_on_save(sender, instance, **kwargs):
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post_on_delete(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def process_image_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if (created and instance.image) or needs_processing(instance):
+        schedule_image_processing(instance, created)
+
+
+@receiver(post_delete, sender=Post)
+def delete_image_variants(sender, instance, **kwargs):
+    delete_variants(
+        instance.image.storage, get_variant_names(instance.image_variants))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_paginator_counts(sender, **kwargs):
+    invalidate_counts()
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+@receiver(pre_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def remember_page_cache_tags(sender, instance, raw=False, **kwargs):
+    if not settings.PAGE_CACHE_ENABLED or raw or instance.pk is None:
+        return
+    stored = sender.objects.filter(pk=instance.pk).first()
+    if stored is not None:
+        instance._page_cache_tags = get_page_cache_tags(stored)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_page_cache(sender, instance, raw=False, **kwargs):
+    if not settings.PAGE_CACHE_ENABLED or raw:
+        return
+    invalidate_pages(
+        get_page_cache_tags(instance)
+        | instance.__dict__.pop('_page_cache_tags', set())
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=User)
+def invalidate_feed_cache(sender, raw=False, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no feed shows.
+    if raw or update_fields == {'last_login'}:
+        return
+    invalidate_feeds()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_sitemap(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_sitemaps('posts', instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_sitemaps(sender, raw=False, **kwargs):
+    # Hiding a category hides its posts, which may sit in any shard.
+    if not raw:
+        invalidate_sitemaps()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_profile_sitemap(sender, instance, raw=False,
+                               update_fields=None, **kwargs):
+    if raw or update_fields == {'last_login'}:
+        return
+    invalidate_sitemaps('profiles', instance.pk)
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    apply_pragmas(connection)
+
+
+@receiver(setting_changed)
+def reset_image_pool(sender, setting, **kwargs):
+    # Workers and retry timers started under the old settings would
+    # otherwise keep running against them.
+    if setting.startswith('IMAGE_PROCESSING_'):
+        image_pool.shutdown()
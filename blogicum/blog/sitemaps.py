@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.db.models import F, Max
+from django.urls import reverse
+from django.utils.html import escape
+
+from .models import Category, Post, User
+from .queryset import get_posts_queryset
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+# section: (URL name, field passed to the URL, lastmod field)
+SITEMAP_SECTIONS = {
+    'posts': ('blog:post_detail', 'id', 'updated_at'),
+    'categories': ('blog:category_posts', 'slug', 'updated_at'),
+    'profiles': ('blog:profile', 'username', None),
+}
+
+
+def get_section_queryset(section):
+    if section == 'posts':
+        return get_posts_queryset(apply_filters=True)
+    if section == 'categories':
+        return Category.objects.filter(is_published=True)
+    return User.objects.filter(is_active=True)
+
+
+def get_shard(pk):
+    return (pk - 1) // settings.SITEMAP_SHARD_SIZE
+
+
+def get_shard_posts(shard):
+    size = settings.SITEMAP_SHARD_SIZE
+    return Post.objects.filter(id__gt=shard * size, id__lte=(shard + 1) * size)
+
+
+def get_sitemap_shards(section):
+    _, _, lastmod_field = SITEMAP_SECTIONS[section]
+    shards = (
+        get_section_queryset(section).order_by()
+        .annotate(shard=(F('id') - 1) / settings.SITEMAP_SHARD_SIZE)
+        .values('shard')
+    )
+    if lastmod_field is None:
+        return [(row['shard'], None) for row in shards.distinct()]
+    return [
+        (row['shard'], row['lastmod'])
+        for row in shards.annotate(lastmod=Max(lastmod_field))
+        .order_by('shard')
+    ]
+
+
+def iter_shard_rows(section, shard):
+    _, url_field, lastmod_field = SITEMAP_SECTIONS[section]
+    fields = ['id', url_field] + ([lastmod_field] if lastmod_field else [])
+    size = settings.SITEMAP_SHARD_SIZE
+    queryset = get_section_queryset(section).filter(
+        id__lte=(shard + 1) * size).order_by('id').values_list(*fields)
+    last_id = shard * size
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id)[:settings.SITEMAP_CHUNK_SIZE])
+        yield from rows
+        if len(rows) < settings.SITEMAP_CHUNK_SIZE:
+            return
+        last_id = rows[-1][0]
+
+
+def _lastmod(value):
+    return f'<lastmod>{value.date().isoformat()}</lastmod>' if value else ''
+
+
+def render_sitemap_index(base_url):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">',
+    ]
+    for section in SITEMAP_SECTIONS:
+        for shard, lastmod in get_sitemap_shards(section):
+            loc = base_url + reverse('blog:sitemap', args=(section, shard))
+            lines.append(
+                f'<sitemap><loc>{escape(loc)}</loc>{_lastmod(lastmod)}'
+                '</sitemap>')
+    lines.append('</sitemapindex>')
+    return '\n'.join(lines).encode()
+
+
+def render_sitemap(section, shard, base_url):
+    url_name = SITEMAP_SECTIONS[section][0]
+    urls = [
+        f'<url><loc>{escape(base_url + reverse(url_name, args=(value,)))}'
+        f'</loc>{_lastmod(lastmod and lastmod[0])}</url>'
+        for _, value, *lastmod in iter_shard_rows(section, shard)
+    ]
+    if not urls:
+        return None
+    return '\n'.join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<urlset xmlns="{SITEMAP_NAMESPACE}">',
+        *urls,
+        '</urlset>',
+    ]).encode()
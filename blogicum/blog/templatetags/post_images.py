@@ -0,0 +1,26 @@
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+
+def _srcset(storage, files, max_width):
+    files = [file for file in files if file[0] <= max_width] or files[:1]
+    return ', '.join(f'{storage.url(name)} {width}w' for width, name in files)
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, variant):
+    max_width = settings.POST_IMAGE_VARIANTS[variant]
+    storage = post.image.storage
+    variants = post.image_variants
+    return {
+        'post': post,
+        'src': post.get_image_url(variant),
+        'srcset': _srcset(storage, variants.get('fallback', []), max_width),
+        'sources': [
+            {'type': mime_type, 'srcset': _srcset(storage, files, max_width)}
+            for mime_type, files in variants.get('sources', {}).items()
+        ],
+        'sizes': settings.POST_IMAGE_SIZES,
+    }
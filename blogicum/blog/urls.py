@@ -1,11 +1,23 @@
+from django.conf import settings
 from django.urls import include, path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
+if settings.ASYNC_READ_VIEWS:
+    PostsListView = views.AsyncPostsListView
+    PostDetailView = views.AsyncPostDetailView
+    CategoryPosts = views.AsyncCategoryPosts
+    ProfileListView = views.AsyncProfileListView
+else:
+    PostsListView = views.PostsListView
+    PostDetailView = views.PostDetailView
+    CategoryPosts = views.CategoryPosts
+    ProfileListView = views.ProfileListView
+
 post_urls = [
-    path('<int:post_id>/', views.PostDetailView.as_view(), name='post_detail'),
+    path('<int:post_id>/', PostDetailView.as_view(), name='post_detail'),
     path('create/', views.PostCreateView.as_view(), name='create_post'),
     path(
         '<int:post_id>/delete/',
@@ -16,6 +28,9 @@ post_urls = [
     path(
         '<int:post_id>/comment/',
         views.CommentCreateView.as_view(), name='add_comment'),
+    path(
+        '<int:post_id>/comments/',
+        views.CommentListView.as_view(), name='post_comments'),
     path(
         '<int:post_id>/edit_comment/<int:comment_id>/',
         views.CommentUpdateView.as_view(), name='edit_comment'),
@@ -24,16 +39,52 @@ post_urls = [
         views.CommentDeleteView.as_view(), name='delete_comment'),
 ]
 
+api_urls = [
+    path('posts/', views.ApiPostsView.as_view(), name='api_posts'),
+    path('posts/<int:post_id>/', views.ApiPostView.as_view(), name='api_post'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.ApiCommentsView.as_view(), name='api_comments'),
+    path(
+        'categories/',
+        views.ApiCategoriesView.as_view(), name='api_categories'),
+]
+
+feed_urls = [
+    path('', feeds.PostsFeed(), name='feed'),
+    path('atom/', feeds.AtomPostsFeed(), name='feed_atom'),
+    path(
+        'category/<slug:category_slug>/',
+        feeds.CategoryPostsFeed(), name='category_feed'),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.AtomCategoryPostsFeed(), name='category_feed_atom'),
+    path(
+        'profile/<str:username>/',
+        feeds.AuthorPostsFeed(), name='profile_feed'),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.AtomAuthorPostsFeed(), name='profile_feed_atom'),
+]
+
 urlpatterns = [
-    path('', views.PostsListView.as_view(), name='index'),
+    path('', PostsListView.as_view(), name='index'),
+    path('search/', views.SearchView.as_view(), name='search'),
     path('posts/', include(post_urls)),
     path(
         'category/<slug:category_slug>/',
-        views.CategoryPosts.as_view(), name='category_posts'),
+        CategoryPosts.as_view(), name='category_posts'),
     path(
         'profile/<str:username>/',
-        views.ProfileListView.as_view(), name='profile'),
+        ProfileListView.as_view(), name='profile'),
     path(
         'edit_profile/',
         views.ProfileUpdateView.as_view(), name='edit_profile'),
+    path('export/<str:kind>/', views.ExportView.as_view(), name='export'),
+    path('api/', include(api_urls)),
+    path('feed/', include(feed_urls)),
+    path('sitemap.xml', views.SitemapView.as_view(), name='sitemap_index'),
+    path(
+        'sitemap-<slug:section>-<int:shard>.xml',
+        views.SitemapView.as_view(), name='sitemap'),
 ]
@@ -1,52 +1,141 @@
+import hashlib
+
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.models import User
-from django.http import Http404
+from django.core.cache import cache
+from django.http import (Http404, HttpResponse, HttpResponseBadRequest,
+                         StreamingHttpResponse)
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views import View
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
                                   UpdateView)
 
-from .forms import CommentForm, PostForm, ProfileForm
-from .mixins import CommentMixin, PostMixin
+from .api import (InvalidQuery, get_api_categories, get_api_comments,
+                  get_api_posts, get_api_rows, serialize_rows)
+from .cache import get_scheduled_timeout, get_sitemap_cache_key
+from .export import (EXPORT_CONTENT_TYPES, EXPORT_FIELDS, get_export_filename,
+                     iter_export)
+from .forms import CommentForm, ExportForm, PostForm, ProfileForm
+from .mixins import (AnonymousPageCacheMixin, ApiListMixin, ApiMixin,
+                     AsyncViewMixin, CommentMixin, ConditionalGetMixin,
+                     PostMixin, PostsPaginationMixin)
 from .models import Category, Comment, Post
-from .queryset import get_posts_queryset
+from .paginator import InvalidCursor, paginate_by_keyset
+from .queryset import (get_post_state, get_posts_queryset,
+                       get_visibility_filter)
+from .search import highlight_results, search_posts
+from .sitemaps import (SITEMAP_SECTIONS, get_shard_posts, render_sitemap,
+                       render_sitemap_index)
 
 
-class PostsListView(ListView):
-    queryset = get_posts_queryset(
-        apply_filters=True,
-        apply_annotation=True
-    )
+class PostsListView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                    PostsPaginationMixin, ListView):
     template_name = 'blog/index.html'
+    page_cache_tags = ('index',)
     paginate_by = settings.PAGINATE_ON_PAGE
-    ordering = '-pub_date'
+
+    def get_queryset(self):
+        return get_posts_queryset(apply_filters=True)
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                     DetailView):
     queryset = get_posts_queryset()
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
-
-    def get_object(self):
-        instance = get_object_or_404(Post, pk=self.kwargs[self.pk_url_kwarg])
-        if (
-                self.request.user != instance.author
-                and not (
-                instance.is_published
-                and instance.category.is_published
-                and instance.pub_date <= timezone.now())
-        ):
-            raise Http404('Страница не существует')
-        return instance
+    page_cache_tags = ('post:{post_id}',)
+
+    def get_post_state(self):
+        if not hasattr(self, '_post_state'):
+            self._post_state = get_post_state(
+                self.kwargs[self.pk_url_kwarg], self.request.user)
+        return self._post_state
+
+    def get_last_modified(self):
+        state = self.get_post_state()
+        return state and state['last_modified']
+
+    def get_page_cache_tags(self):
+        tags = super().get_page_cache_tags()
+        state = self.get_post_state()
+        if state is not None:
+            tags += [
+                f'category:{state["category_slug"]}',
+                f'location:{state["location_id"]}',
+            ]
+        return tags
+
+    def get_etag_extra(self):
+        return ()
+
+    def get_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+        return get_object_or_404(
+            queryset.filter(get_visibility_filter(self.request.user)),
+            pk=self.kwargs[self.pk_url_kwarg]
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related('author')
+        context['comments'] = paginate_by_keyset(
+            self.object.comments.select_related('author'),
+            settings.COMMENTS_ON_PAGE,
+            key_field='created_at',
+            ascending=True
+        )
+        return context
+
+
+class CommentListView(ListView):
+    template_name = 'includes/comment_list.html'
+    paginate_by = settings.COMMENTS_ON_PAGE
+
+    def get_queryset(self):
+        self.post = get_object_or_404(
+            Post.objects.filter(get_visibility_filter(self.request.user)),
+            pk=self.kwargs['post_id']
         )
+        return self.post.comments.select_related('author')
+
+    def paginate_queryset(self, queryset, page_size):
+        try:
+            page = paginate_by_keyset(
+                queryset, page_size,
+                after=self.request.GET.get('after'),
+                key_field='created_at',
+                ascending=True
+            )
+        except InvalidCursor:
+            raise Http404('Страница не существует')
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.post
+        context['comments'] = context['page_obj']
+        return context
+
+
+class SearchView(ListView):
+    template_name = 'blog/search.html'
+    paginate_by = settings.PAGINATE_ON_PAGE
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(
+            get_posts_queryset(apply_filters=True), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        page.object_list = highlight_results(list(page.object_list))
+        context['query'] = self.query
         return context
 
 
@@ -66,10 +155,12 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class CategoryPosts(LoginRequiredMixin, ListView):
+class CategoryPosts(ConditionalGetMixin, AnonymousPageCacheMixin,
+                    PostsPaginationMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
     slug_url_kwarg = 'category_slug'
+    page_cache_tags = ('category:{category_slug}', 'locations')
     paginate_by = settings.PAGINATE_ON_PAGE
 
     def get_object(self):
@@ -88,8 +179,7 @@ class CategoryPosts(LoginRequiredMixin, ListView):
 
         queryset = get_posts_queryset(
             manager=category.posts,
-            apply_filters=True,
-            apply_annotation=True
+            apply_filters=True
         )
         return queryset
 
@@ -108,8 +198,7 @@ class PostDeleteView(LoginRequiredMixin, PostMixin, DeleteView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['form'] = self.get_form()
-        context['form'].instance = self.get_object()
+        context['form'] = PostForm(instance=self.get_object())
         return context
 
 
@@ -140,7 +229,7 @@ class CommentDeleteView(CommentMixin, DeleteView):
     template_name = 'blog/comment.html'
 
 
-class ProfileListView(ListView):
+class ProfileListView(PostsPaginationMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = settings.PAGINATE_ON_PAGE
@@ -150,19 +239,23 @@ class ProfileListView(ListView):
     def get_user(self):
         return get_object_or_404(User, username=self.kwargs['username'])
 
+    def get_count_cache_key(self):
+        key = super().get_count_cache_key()
+        if self.request.user.username == self.kwargs['username']:
+            return f'{key}:own'
+        return key
+
     def get_queryset(self):
         user = self.get_user()
         if self.request.user == user:
             queryset = get_posts_queryset(
                 manager=user.posts,
-                apply_filters=False,
-                apply_annotation=True
+                apply_filters=False
             )
         else:
             queryset = get_posts_queryset(
                 manager=user.posts,
-                apply_filters=True,
-                apply_annotation=True
+                apply_filters=True
             )
         return queryset
 
@@ -184,3 +277,125 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return reverse_lazy(
             'blog:profile', kwargs={'username': self.request.user}
         )
+
+
+class ExportView(UserPassesTestMixin, View):
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, kind):
+        if kind not in EXPORT_FIELDS:
+            raise Http404('Неизвестный вид выгрузки')
+        form = ExportForm(request.GET)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
+        options = form.cleaned_data
+        response = StreamingHttpResponse(
+            iter_export(kind, **options),
+            content_type=(
+                'application/gzip' if options['gzip']
+                else EXPORT_CONTENT_TYPES[options['format']])
+        )
+        filename = get_export_filename(
+            kind, options['format'], options['gzip'])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class AsyncPostsListView(AsyncViewMixin, PostsListView):
+    pass
+
+
+class AsyncPostDetailView(AsyncViewMixin, PostDetailView):
+    pass
+
+
+class AsyncCategoryPosts(AsyncViewMixin, CategoryPosts):
+    pass
+
+
+class AsyncProfileListView(AsyncViewMixin, ProfileListView):
+    pass
+
+
+class ApiPostsView(ConditionalGetMixin, ApiListMixin, View):
+    api_kind = 'posts'
+
+    def get_queryset(self):
+        return get_api_posts(
+            category=self.request.GET.get('category'),
+            author=self.request.GET.get('author'))
+
+
+class ApiPostView(ApiMixin, View):
+    api_kind = 'posts'
+
+    def get(self, request, post_id):
+        try:
+            fields = self.get_fields()
+        except InvalidQuery as error:
+            return self.render_error(str(error))
+        row = get_api_rows(
+            get_api_posts().filter(pk=post_id), self.api_kind, fields
+        ).first()
+        if row is None:
+            return self.render_error('Публикация не найдена.', status=404)
+        return self.render_json(
+            serialize_rows([row], self.api_kind, fields)[0])
+
+
+class ApiCommentsView(ApiListMixin, View):
+    api_kind = 'comments'
+    key_field = 'created_at'
+    ascending = True
+
+    def get(self, request, post_id):
+        if not get_api_posts().filter(pk=post_id).exists():
+            return self.render_error('Публикация не найдена.', status=404)
+        return super().get(request, post_id)
+
+    def get_queryset(self):
+        return get_api_comments(self.kwargs['post_id'])
+
+
+class ApiCategoriesView(ApiMixin, View):
+    api_kind = 'categories'
+
+    def get(self, request):
+        try:
+            fields = self.get_fields()
+        except InvalidQuery as error:
+            return self.render_error(str(error))
+        rows = get_api_rows(get_api_categories(), self.api_kind, fields)
+        return self.render_json(
+            {'results': serialize_rows(rows, self.api_kind, fields)})
+
+
+class SitemapView(View):
+
+    def get_cache_timeout(self, section, shard):
+        timeout = settings.SITEMAP_CACHE_TIMEOUT
+        if section is None:
+            return get_scheduled_timeout(timeout)
+        if section == 'posts':
+            return get_scheduled_timeout(timeout, get_shard_posts(shard))
+        return timeout
+
+    def get(self, request, section=None, shard=None):
+        if section is not None and section not in SITEMAP_SECTIONS:
+            raise Http404('Неизвестный раздел карты сайта')
+        key = get_sitemap_cache_key(request, section, shard)
+        response = cache.get(key)
+        if response is None:
+            base_url = request.build_absolute_uri('/')[:-1]
+            content = (
+                render_sitemap_index(base_url) if section is None
+                else render_sitemap(section, shard, base_url))
+            if content is None:
+                raise Http404('Такой части карты сайта нет')
+            response = HttpResponse(content, content_type='application/xml')
+            response['ETag'] = quote_etag(hashlib.md5(content).hexdigest())
+            cache.set(key, response, self.get_cache_timeout(section, shard))
+        return get_conditional_response(
+            request, etag=response['ETag'], response=response) or response
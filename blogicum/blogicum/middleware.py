@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from blog.executors import db_execute_wrappers
+
+from .routers import current_request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+
+
+class HybridMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.handle(request)
+
+
+class QueryBudgetMiddleware(HybridMiddleware):
+
+    def handle(self, request):
+        request.timings = timings = RequestTimings()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            stack.enter_context(self.wrap_executor_queries(timings))
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+        return self.report(request, response, started)
+
+    async def __acall__(self, request):
+        request.timings = timings = RequestTimings()
+        started = time.perf_counter()
+        with self.wrap_executor_queries(timings):
+            response = await self.get_response(request)
+        return self.report(request, response, started)
+
+    @contextmanager
+    def wrap_executor_queries(self, timings):
+        # Async views query from executor threads, which install the
+        # wrappers found in this context variable.
+        token = db_execute_wrappers.set(
+            (*db_execute_wrappers.get(), timings))
+        try:
+            yield
+        finally:
+            db_execute_wrappers.reset(token)
+
+    def report(self, request, response, started):
+        timings = request.timings
+        total_time = time.perf_counter() - started
+
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        response['Server-Timing'] = (
+            f'db;dur={timings.sql_time * 1000:.1f};'
+            f'desc="{timings.queries} queries", '
+            f'tpl;dur={timings.template_time * 1000:.1f}, '
+            f'total;dur={total_time * 1000:.1f}'
+        )
+        if view_name:
+            response['Server-Timing'] += f', view;desc="{view_name}"'
+
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is not None and timings.queries > budget:
+            logger.warning(
+                '%s: %d SQL-запросов при бюджете %d (%s)',
+                view_name, timings.queries, budget, request.get_full_path()
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+
+        def record_render_time(rendered):
+            request.timings.template_time += time.perf_counter() - started
+
+        response.add_post_render_callback(record_render_time)
+        return response
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+
+    def handle(self, request):
+        token = current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.mark_sticky(request, response)
+
+    async def __acall__(self, request):
+        token = current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        return self.mark_sticky(request, response)
+
+    def mark_sticky(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.use_replica = (
+            request.method in ('GET', 'HEAD')
+            and request.resolver_match.view_name in settings.REPLICA_VIEWS
+            and settings.REPLICA_STICKY_COOKIE not in request.COOKIES
+        )
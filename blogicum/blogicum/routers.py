@@ -0,0 +1,29 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+current_request = ContextVar('current_request', default=None)
+
+
+class ReplicaRouter:
+    # Sessions and users are read from the primary: a replica that has not
+    # been synced yet would not know about a fresh login or registration.
+    replica_apps = {'blog'}
+
+    def db_for_read(self, model, **hints):
+        request = current_request.get()
+        if (getattr(request, 'use_replica', False)
+                and settings.DATABASE_REPLICAS
+                and model._meta.app_label in self.replica_apps):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == 'default'
@@ -1,3 +1,4 @@
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -35,6 +36,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blogicum.middleware.QueryBudgetMiddleware',
+    'blogicum.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,7 +79,38 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': 60,
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+# Aliases from DATABASES that serve REPLICA_VIEWS, e.g. ['replica'].
+DATABASE_REPLICAS = []
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # manage.py page_cache_stats runs in its own process, so the hit and
+    # miss counters need a cache that every process shares. Point this at
+    # Memcached or Redis when the site runs on several hosts.
+    'page_cache_stats': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'blogicum-page-cache-stats',
+    },
 }
 
 
@@ -144,3 +178,118 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 PAGINATE_ON_PAGE = 10
+
+PAGINATOR_COUNT_CACHE_TIMEOUT = 60
+
+PUBLICATION_CUTOFF_BUCKET = 30
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+PAGE_CACHE_ENABLED = False
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+PAGE_CACHE_STATS_CACHE = 'page_cache_stats'
+
+COMMENTS_ON_PAGE = 20
+
+EXPORT_CHUNK_SIZE = 2000
+
+API_MAX_LIMIT = 100
+
+FEED_ITEMS = 20
+
+# Capped at the next scheduled pub_date among the feed's posts.
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+SITEMAP_SHARD_SIZE = 50_000
+
+SITEMAP_CHUNK_SIZE = 2000
+
+# Capped at the next scheduled pub_date for the index and the post shards.
+SITEMAP_CACHE_TIMEOUT = 60 * 60
+
+POST_IMAGE_WIDTHS = (320, 640, 960, 1280)
+
+POST_IMAGE_FORMATS = ('AVIF', 'WEBP')
+
+POST_IMAGE_VARIANTS = {
+    'card': 640,
+    'detail': 1280,
+}
+
+POST_IMAGE_SIZES = '(max-width: 40rem) 100vw, 38rem'
+
+POST_IMAGE_QUALITY = 80
+
+IMAGE_PROCESSING_WORKERS = 2
+
+IMAGE_PROCESSING_QUEUE_SIZE = 100
+
+IMAGE_PROCESSING_MAX_ATTEMPTS = 3
+
+IMAGE_PROCESSING_RETRY_DELAY = 30
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Serve the post list, category, profile and detail pages with async views;
+# only useful under ASGI.
+ASYNC_READ_VIEWS = False
+
+ASYNC_DB_WORKERS = 4
+
+ASYNC_RENDER_WORKERS = 2
+
+REPLICA_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+    'blog:api_posts',
+    'blog:api_post',
+    'blog:api_comments',
+    'blog:api_categories',
+    'blog:feed',
+    'blog:feed_atom',
+    'blog:category_feed',
+    'blog:category_feed_atom',
+    'blog:profile_feed',
+    'blog:profile_feed_atom',
+    'blog:sitemap_index',
+    'blog:sitemap',
+    'pages:about',
+    'pages:rules',
+)
+
+REPLICA_STICKY_COOKIE = 'use_primary'
+
+REPLICA_STICKY_SECONDS = 60
+
+# Queries of a logged-in request with a cold paginator count cache.
+QUERY_BUDGETS = {
+    'blog:index': 5,
+    'blog:category_posts': 6,
+    'blog:profile': 6,
+    'blog:post_detail': 5,
+    'blog:search': 4,
+    'blog:api_posts': 4,
+    'blog:api_post': 3,
+    'blog:api_comments': 4,
+    'blog:api_categories': 3,
+    'blog:feed': 2,
+    'blog:feed_atom': 2,
+    'blog:category_feed': 3,
+    'blog:category_feed_atom': 3,
+    'blog:profile_feed': 3,
+    'blog:profile_feed_atom': 3,
+    'blog:sitemap_index': 4,
+    'pages:about': 2,
+    'pages:rules': 2,
+}
@@ -2,6 +2,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
+from django.views.generic import TemplateView
 from .views import RegistrationView
 
 handler404 = 'pages.views.page_not_found'
@@ -9,6 +10,11 @@ handler500 = 'pages.views.server_error'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path(
+        'robots.txt',
+        TemplateView.as_view(
+            template_name='robots.txt', content_type='text/plain'),
+        name='robots'),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
     path(
@@ -1,6 +1,7 @@
 import os
 import re
 import time
+from contextlib import contextmanager
 from http import HTTPStatus
 from inspect import getsource
 from pathlib import Path
@@ -15,6 +16,7 @@ from typing import (
     NamedTuple,
     TypeVar,
 )
+from unittest import mock
 
 import pytest
 from django.apps import apps
@@ -41,6 +43,32 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Uploads and the image variants made from them stay out of the
+    # project's media directory.
+    settings.MEDIA_ROOT = tmp_path / 'media'
+
+
+@pytest.fixture(autouse=True)
+def inline_image_processing(settings):
+    # Pool threads and retry timers would write files and run queries
+    # outside the test's transaction and could outlive the test.
+    settings.IMAGE_PROCESSING_WORKERS = 0
+
+
+@pytest.fixture
+def clock():
+    # Moves both the publication cut-off and the cache expiry clock.
+    @contextmanager
+    def move_to(moment):
+        with mock.patch('django.utils.timezone.now', return_value=moment), \
+                mock.patch('django.core.cache.backends.locmem.time',
+                           mock.Mock(time=moment.timestamp)):
+            yield
+    return move_to
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
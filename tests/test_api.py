@@ -0,0 +1,112 @@
+import base64
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def unpublished_category(mixer):
+    return mixer.blend('blog.Category', is_published=False)
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=published_location, is_published=True, image='',
+            pub_date=now - timedelta(days=index + 1))
+        for index in range(5)
+    ]
+
+
+def test_api_posts_cursor_pagination(client, api_posts):
+    response = client.get('/api/posts/?limit=2')
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert [item['id'] for item in data['results']] == [
+        post.id for post in api_posts[:2]]
+    assert data['previous'] is None
+    seen = [item['id'] for item in data['results']]
+    while data['next']:
+        data = client.get(data['next']).json()
+        seen.extend(item['id'] for item in data['results'])
+    assert seen == [post.id for post in api_posts], (
+        'Убедитесь, что курсоры API проходят по всем публикациям по порядку.'
+    )
+    back = client.get(data['previous']).json()
+    assert [item['id'] for item in back['results']] == [
+        post.id for post in api_posts[2:4]]
+
+
+def test_api_posts_visibility(client, api_posts, mixer, user,
+                              published_category, unpublished_category):
+    hidden = [
+        mixer.blend('blog.Post', author=user, category=published_category,
+                    is_published=False),
+        mixer.blend('blog.Post', author=user, category=unpublished_category,
+                    is_published=True),
+        mixer.blend('blog.Post', author=user, category=published_category,
+                    is_published=True,
+                    pub_date=timezone.now() + timedelta(days=1)),
+    ]
+    ids = {
+        item['id']
+        for item in client.get('/api/posts/?limit=100').json()['results']
+    }
+    assert ids == {post.id for post in api_posts}, (
+        'Убедитесь, что API показывает только опубликованные публикации.'
+    )
+    for post in hidden:
+        assert client.get(f'/api/posts/{post.id}/').status_code == (
+            HTTPStatus.NOT_FOUND)
+
+
+def test_api_sparse_fields(client, api_posts, django_assert_num_queries):
+    post = api_posts[0]
+    with django_assert_num_queries(2):
+        data = client.get('/api/posts/?fields=id,title&limit=1').json()
+    assert data['results'] == [{'id': post.id, 'title': post.title}], (
+        'Убедитесь, что API отдаёт только поля из параметра fields.'
+    )
+    detail = client.get(
+        f'/api/posts/{post.id}/?fields=author,location,image').json()
+    assert detail == {
+        'author': post.author.username,
+        'location': post.location.name,
+        'image': None,
+    }
+    assert client.get('/api/posts/?fields=id,password').status_code == (
+        HTTPStatus.BAD_REQUEST)
+    assert client.get('/api/posts/?after=broken').status_code == (
+        HTTPStatus.BAD_REQUEST)
+    oversized = base64.urlsafe_b64encode(
+        f'{timezone.now().isoformat()}|{10 ** 30}'.encode()).decode()
+    response = client.get(f'/api/posts/?after={oversized}')
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Убедитесь, что курсор с несуществующим id отклоняется с ошибкой 400.'
+    )
+    assert 'error' in response.json()
+    assert client.get('/api/posts/?limit=1000').status_code == (
+        HTTPStatus.BAD_REQUEST)
+
+
+def test_api_comments_and_categories(client, api_posts, mixer, user,
+                                     published_category,
+                                     unpublished_category):
+    post = api_posts[0]
+    comments = mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    data = client.get(
+        f'/api/posts/{post.id}/comments/?fields=id,author').json()
+    assert data['results'] == [
+        {'id': comment.id, 'author': user.username}
+        for comment in sorted(
+            comments, key=lambda comment: (comment.created_at, comment.id))
+    ]
+    categories = client.get('/api/categories/?fields=slug').json()
+    assert categories['results'] == [{'slug': published_category.slug}]
@@ -0,0 +1,82 @@
+import asyncio
+import importlib
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test.client import AsyncClient
+from django.urls import clear_url_caches
+
+from blog.executors import BoundedExecutor
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def async_urls(settings):
+    import blog.urls
+    import blogicum.urls
+
+    def reload_urls():
+        importlib.reload(blog.urls)
+        importlib.reload(blogicum.urls)
+        clear_url_caches()
+
+    settings.ASYNC_READ_VIEWS = True
+    reload_urls()
+    yield
+    settings.ASYNC_READ_VIEWS = False
+    reload_urls()
+
+
+@async_to_sync
+async def async_get(url):
+    return await AsyncClient().get(url)
+
+
+@pytest.mark.parametrize('url', [
+    '/',
+    '/posts/{post.id}/',
+    '/category/{post.category.slug}/',
+    '/profile/{post.author.username}/',
+])
+def test_async_read_views(async_urls, post_with_published_location, url):
+    post = post_with_published_location
+    response = async_get(url.format(post=post))
+    assert response.status_code == HTTPStatus.OK
+    assert post.title in response.content.decode(), (
+        'Убедитесь, что асинхронное представление показывает публикации.'
+    )
+    assert '0 queries' not in response['Server-Timing'], (
+        'Убедитесь, что запросы из пула потоков учитываются в бюджете.'
+    )
+
+
+def test_async_view_not_found(async_urls):
+    response = async_get('/posts/0/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_bounded_executor_limits_concurrency(settings):
+    settings.ASYNC_DB_WORKERS = 2
+    executor = BoundedExecutor('ASYNC_DB_WORKERS', 'test')
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    async def run_jobs():
+        await asyncio.gather(*(executor.run(job) for _ in range(10)))
+
+    async_to_sync(run_jobs)()
+    assert peak[0] == 2, (
+        'Убедитесь, что пул ограничивает число одновременных задач.'
+    )
@@ -0,0 +1,79 @@
+import gzip
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+pytestmark = [pytest.mark.django_db]
+
+CREATED_AT = '2022-12-18T23:03:52.159Z'
+
+
+def _fixture():
+    return [
+        {'model': 'blog.comment', 'pk': pk, 'fields': {
+            'text': f'Комментарий {pk}', 'post': 1, 'author': 1,
+            'created_at': CREATED_AT}}
+        for pk in range(1, 4)
+    ] + [
+        {'model': 'blog.post', 'pk': 1, 'fields': {
+            'title': 'Публикация', 'text': 'Текст', 'is_published': True,
+            'pub_date': CREATED_AT, 'created_at': CREATED_AT,
+            'author': 1, 'category': 1, 'location': None, 'image': '',
+            'comment_count': 0}},
+        {'model': 'auth.user', 'pk': 1, 'fields': {
+            'username': 'loaded', 'password': '!', 'groups': [],
+            'user_permissions': []}},
+        {'model': 'blog.category', 'pk': 1, 'fields': {
+            'title': 'Категория', 'description': 'Описание',
+            'slug': 'loaded', 'is_published': True,
+            'created_at': CREATED_AT}},
+        {'model': 'sessions.session', 'pk': 'x', 'fields': {}},
+    ]
+
+
+@pytest.mark.parametrize('compressed', (False, True))
+def test_bulkload(tmp_path, compressed):
+    from blog.models import Category, Comment, Post
+
+    path = tmp_path / ('db.json.gz' if compressed else 'db.json')
+    opener = gzip.open if compressed else open
+    with opener(path, 'wt', encoding='utf-8') as stream:
+        json.dump(_fixture(), stream, ensure_ascii=False)
+
+    call_command('bulkload', str(path), batch_size=2)
+    assert Comment.objects.count() == 3
+    assert get_user_model().objects.filter(username='loaded').exists()
+    post = Post.objects.get(pk=1)
+    assert post.comment_count == 3, (
+        'Убедитесь, что после загрузки пересчитываются счётчики'
+        ' комментариев.'
+    )
+    assert Category.objects.get(pk=1).created_at.year == 2022, (
+        'Убедитесь, что загрузка сохраняет даты из фикстуры.'
+    )
+    assert post.updated_at is not None
+
+
+def test_bulkload_resets_feeds_and_sitemaps(tmp_path, client):
+    client.get('/feed/')
+    client.get('/sitemap.xml')
+    path = tmp_path / 'db.json'
+    path.write_text(json.dumps(_fixture()), encoding='utf-8')
+    call_command('bulkload', str(path))
+    assert '/posts/1/' in client.get('/feed/').content.decode(), (
+        'Убедитесь, что после загрузки сбрасывается кеш лент.'
+    )
+    assert '/sitemap-categories-0.xml' in (
+        client.get('/sitemap.xml').content.decode()), (
+        'Убедитесь, что после загрузки сбрасывается кеш карты сайта.'
+    )
+
+
+def test_bulkload_rejects_broken_fixture(tmp_path):
+    path = tmp_path / 'db.json'
+    path.write_text('[{"model": "blog.category"', encoding='utf-8')
+    with pytest.raises(CommandError):
+        call_command('bulkload', str(path))
@@ -0,0 +1,108 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_delete, pre_delete
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment
+from conftest import N_PER_FIXTURE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer, post_with_published_location, another_user,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    comments = mixer.cycle(N_PER_FIXTURE).blend(
+        'blog.Comment', post=post, author=another_user)
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE, (
+        'Убедитесь, что счётчик комментариев увеличивается при добавлении'
+        ' комментария.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE - 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        'Убедитесь, что счётчик комментариев уменьшается при каскадном'
+        ' удалении комментариев.'
+    )
+
+
+def test_stale_post_save_keeps_comment_count(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post)
+    post.title = 'Изменённый заголовок'
+    post.save()
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(N_PER_FIXTURE).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=0)
+
+    with pytest.raises(CommandError):
+        call_command('recount_comments', check=True)
+    call_command('recount_comments')
+    call_command('recount_comments', check=True)
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE
+
+
+def test_cascade_delete_skips_counter_updates(
+        mixer, post_with_published_location, another_user, user,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    other_post = mixer.blend('blog.Post', author=another_user)
+    mixer.cycle(N_PER_FIXTURE).blend('blog.Comment', post=post)
+    mixer.cycle(N_PER_FIXTURE).blend(
+        'blog.Comment', post=other_post, author=user)
+    with CaptureQueriesContext(connection) as queries, \
+            django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+    updates = [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        'Убедитесь, что при каскадном удалении счётчики пересчитываются '
+        'одним запросом, а не по запросу на комментарий.'
+    )
+    other_post.refresh_from_db()
+    assert other_post.comment_count == 0
+
+
+@pytest.mark.parametrize('signal', [pre_delete, post_delete])
+def test_failed_delete_keeps_counters(
+        mixer, post_with_published_location, signal,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    comments = mixer.cycle(2).blend('blog.Comment', post=post)
+
+    def fail(**kwargs):
+        raise DatabaseError('database is locked')
+
+    signal.connect(fail, sender=Comment, weak=False)
+    try:
+        with pytest.raises(DatabaseError), transaction.atomic():
+            comments[0].delete()
+    finally:
+        signal.disconnect(fail, sender=Comment)
+    with django_capture_on_commit_callbacks(execute=True):
+        comments[1].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что неудавшееся удаление не ломает пересчёт счётчика '
+        'при следующих удалениях.'
+    )
@@ -0,0 +1,43 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    return mixer.cycle(settings.COMMENTS_ON_PAGE + 5).blend(
+        'blog.Comment', post=post_with_published_location)
+
+
+def test_comments_are_paginated(
+        unlogged_client, post_with_published_location, many_comments):
+    post = post_with_published_location
+    response = unlogged_client.get(f'/posts/{post.id}/')
+    comments = response.context['comments']
+    assert [c.id for c in comments] == [
+        c.id for c in many_comments[:settings.COMMENTS_ON_PAGE]], (
+        'Убедитесь, что на странице публикации выводится только первая'
+        ' порция комментариев.'
+    )
+    assert comments.has_next()
+
+    response = unlogged_client.get(
+        f'/posts/{post.id}/comments/?after={comments.next_cursor}')
+    assert response.status_code == HTTPStatus.OK
+    assert [c.id for c in response.context['comments']] == [
+        c.id for c in many_comments[settings.COMMENTS_ON_PAGE:]], (
+        'Убедитесь, что фрагмент комментариев возвращает следующую порцию.'
+    )
+    assert not response.context['comments'].has_next()
+
+
+def test_comment_fragment_of_hidden_post(
+        another_user_client, post_with_published_location, many_comments):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
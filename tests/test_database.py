@@ -0,0 +1,55 @@
+import pytest
+from django.db import connections
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    default = connections['default']
+    db = default.__class__(
+        {**default.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')})
+    yield db
+    db.close()
+
+
+def _pragma(db, name):
+    with db.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def test_pragmas_applied_on_connect(file_connection):
+    assert _pragma(file_connection, 'journal_mode') == 'wal', (
+        'Убедитесь, что новое соединение с SQLite переводится в режим WAL.'
+    )
+    assert _pragma(file_connection, 'synchronous') == 1
+    assert _pragma(file_connection, 'busy_timeout') == 20000
+    assert _pragma(file_connection, 'temp_store') == 2
+
+
+def test_pragmas_not_counted_as_queries(settings, file_connection):
+    settings.SQLITE_PRAGMAS = {'cache_size': -1000}
+    executed = []
+    with file_connection.execute_wrapper(
+            lambda execute, sql, *args: executed.append(sql)
+            or execute(sql, *args)):
+        assert _pragma(file_connection, 'cache_size') == -1000
+    assert executed == ['PRAGMA cache_size'], (
+        'Убедитесь, что настройки соединения не учитываются в числе '
+        'запросов к базе.'
+    )
+
+
+@pytest.mark.parametrize('lookup', [
+    {'category_id': 1},
+    {'category_id': 1, 'is_published': False},
+])
+def test_category_lookups_use_index(lookup):
+    from blog.models import Post
+
+    plan = Post.objects.filter(**lookup).explain()
+    assert 'SCAN blog_post' not in plan, (
+        'Убедитесь, что поиск публикаций по категории, включая '
+        'неопубликованные, не просматривает всю таблицу.'
+    )
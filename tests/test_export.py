@@ -0,0 +1,89 @@
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.test.client import Client
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def staff_client(user):
+    user.is_staff = True
+    user.save()
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def exported_posts(mixer, user, another_user, published_category):
+    old = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(days=30))
+    recent = mixer.blend(
+        'blog.Post', author=another_user, category=published_category,
+        pub_date=timezone.now() - timedelta(days=1))
+    mixer.blend('blog.Comment', post=recent, author=user)
+    return old, recent
+
+
+def test_export_requires_staff(user_client, unlogged_client):
+    assert user_client.get('/export/posts/').status_code == (
+        HTTPStatus.FORBIDDEN), (
+        'Убедитесь, что выгрузка доступна только сотрудникам.'
+    )
+    assert unlogged_client.get('/export/posts/').status_code == (
+        HTTPStatus.FOUND)
+
+
+def test_export_posts_jsonl(staff_client, exported_posts, another_user):
+    old, recent = exported_posts
+    response = staff_client.get('/export/posts/')
+    assert response.streaming, (
+        'Убедитесь, что выгрузка отдаётся потоком.'
+    )
+    rows = [
+        json.loads(line)
+        for line in b''.join(response.streaming_content).splitlines()
+    ]
+    assert [row['id'] for row in rows] == [old.id, recent.id]
+    assert rows[1]['comment_count'] == 1
+
+    since = (timezone.now() - timedelta(days=7)).date().isoformat()
+    response = staff_client.get(f'/export/posts/?since={since}')
+    content = b''.join(response.streaming_content).decode()
+    assert [json.loads(line)['id'] for line in content.splitlines()] == [
+        recent.id], (
+        'Убедитесь, что выгрузка фильтруется по периоду.'
+    )
+    response = staff_client.get(
+        f'/export/posts/?author={another_user.username}')
+    assert len(b''.join(response.streaming_content).splitlines()) == 1
+
+
+def test_export_comments_csv_gzip(staff_client, exported_posts):
+    response = staff_client.get('/export/comments/?format=csv&gzip=on')
+    assert response['Content-Type'] == 'application/gzip'
+    content = gzip.decompress(b''.join(response.streaming_content))
+    rows = list(csv.reader(io.StringIO(content.decode())))
+    assert rows[0] == ['id', 'post', 'author', 'text', 'created_at']
+    assert len(rows) == 2
+    assert staff_client.get(
+        '/export/comments/?since=2023-01-02&until=2023-01-01'
+    ).status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_export_command(tmp_path, exported_posts, published_category):
+    output = tmp_path / 'posts.jsonl.gz'
+    call_command(
+        'export', 'posts', gzip=True, output=str(output),
+        category=published_category.slug)
+    lines = gzip.decompress(output.read_bytes()).splitlines()
+    assert len(lines) == len(exported_posts)
@@ -0,0 +1,202 @@
+import os
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_location, published_category):
+    return mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        location=published_location,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+@override_settings(PUBLICATION_CUTOFF_BUCKET=30)
+def test_publication_cutoff_is_bucketed():
+    from blog.queryset import get_publication_cutoff
+
+    now = timezone.now()
+    with mock.patch('blog.queryset.timezone.now', return_value=now):
+        cutoff = get_publication_cutoff()
+    assert cutoff <= now
+    assert now - cutoff < timedelta(seconds=30)
+    assert cutoff.timestamp() % 30 == 0
+
+
+def test_scheduled_post_appears_without_restart(
+        another_user_client, scheduled_post):
+    response = another_user_client.get('/')
+    assert scheduled_post not in response.context['page_obj']
+
+    later = timezone.now() + timedelta(hours=2)
+    with mock.patch('blog.queryset.timezone.now', return_value=later):
+        response = another_user_client.get('/')
+    assert scheduled_post in response.context['page_obj'], (
+        'Убедитесь, что отложенная публикация появляется в ленте после'
+        ' наступления даты публикации.'
+    )
+
+
+def _rendered_templates(response):
+    return [template.name for template in response.templates]
+
+
+def test_post_cards_are_cached(user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get('/')
+    response = user_client.get('/')
+    assert 'includes/post_card.html' not in _rendered_templates(response), (
+        'Убедитесь, что карточки публикаций берутся из кэша.'
+    )
+
+    post.category.title = 'Новое название категории'
+    post.category.save()
+    response = user_client.get('/')
+    assert 'includes/post_card.html' in _rendered_templates(response)
+    assert 'Новое название категории' in response.content.decode('utf-8'), (
+        'Убедитесь, что кэш карточки сбрасывается при изменении категории.'
+    )
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+def test_anonymous_page_cache(
+        unlogged_client, user_client, post_with_published_location):
+    post = post_with_published_location
+    category_url = f'/category/{post.category.slug}/'
+    for url in ('/', category_url, f'/posts/{post.id}/'):
+        assert unlogged_client.get(url)['X-Page-Cache'] == 'MISS'
+        assert unlogged_client.get(url)['X-Page-Cache'] == 'HIT', (
+            'Убедитесь, что страница для анонимного пользователя берётся'
+            ' из кэша.'
+        )
+    assert 'X-Page-Cache' not in user_client.get('/')
+
+    post.category.is_published = False
+    post.category.save()
+    response = unlogged_client.get(category_url)
+    assert response.status_code == 404, (
+        'Убедитесь, что снятие категории с публикации сбрасывает кэш её'
+        ' страниц.'
+    )
+    response = unlogged_client.get('/')
+    assert response['X-Page-Cache'] == 'MISS'
+    assert post not in response.context['page_obj']
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+def test_related_changes_invalidate_detail_page(
+        mixer, unlogged_client, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend(
+        'blog.Post', author=post.author, category=post.category,
+        location=post.location)
+    url = f'/posts/{post.id}/'
+    for related in (post.location, post.category):
+        unlogged_client.get(url)
+        assert unlogged_client.get(url)['X-Page-Cache'] == 'HIT'
+        with CaptureQueriesContext(connection) as queries:
+            related.save()
+        assert not any(
+            'FROM "blog_post"' in query['sql']
+            for query in queries.captured_queries
+        ), (
+            'Убедитесь, что сброс кэша при изменении категории или '
+            'местоположения не перебирает их публикации.'
+        )
+        assert unlogged_client.get(url)['X-Page-Cache'] == 'MISS', (
+            'Убедитесь, что изменение категории или местоположения сбрасывает'
+            ' кэш страниц их публикаций.'
+        )
+
+
+def test_conditional_get(
+        mixer, unlogged_client, post_with_published_location,
+        django_assert_num_queries, django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    for url in ('/', f'/category/{post.category.slug}/', f'/posts/{post.id}/'):
+        response = unlogged_client.get(url)
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+        with django_assert_num_queries(1):
+            not_modified = unlogged_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified.status_code == 304, (
+            'Убедитесь, что при совпадении ETag возвращается статус 304.'
+        )
+        assert unlogged_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        ).status_code == 304
+
+    etag = unlogged_client.get(f'/posts/{post.id}/')['ETag']
+    comment = mixer.blend('blog.Comment', post=post)
+    response = unlogged_client.get(
+        f'/posts/{post.id}/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что новый комментарий меняет ETag страницы публикации.'
+    )
+    etag = response['ETag']
+    with django_capture_on_commit_callbacks(execute=True):
+        comment.delete()
+    response = unlogged_client.get(
+        f'/posts/{post.id}/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+def test_delete_moves_last_modified(
+        mixer, unlogged_client, post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        'blog.Post', author=post.author, category=post.category,
+        is_published=True, pub_date=post.pub_date)
+    last_modified = unlogged_client.get('/')['Last-Modified']
+    later = time.time_ns() + 10 ** 10
+    with mock.patch('blog.paginator.time.time_ns', return_value=later):
+        hidden.delete()
+    response = unlogged_client.get('/', HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200, (
+        'Убедитесь, что удаление публикации меняет Last-Modified ленты.'
+    )
+
+
+def test_page_cache_stats_command_sees_server_counts(
+        settings, tmp_path, unlogged_client, post_with_published_location):
+    location = tmp_path / 'stats'
+    settings.CACHES = {
+        **settings.CACHES,
+        'page_cache_stats': {
+            **settings.CACHES['page_cache_stats'], 'LOCATION': location},
+    }
+    settings.PAGE_CACHE_ENABLED = True
+    unlogged_client.get('/')
+    unlogged_client.get('/')
+    (tmp_path / 'stats_settings.py').write_text(
+        'from blogicum.settings import *  # noqa\n'
+        f"CACHES['page_cache_stats']['LOCATION'] = {str(location)!r}\n")
+    manage = Path(settings.BASE_DIR) / 'manage.py'
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join([str(tmp_path), str(manage.parent)]),
+    }
+    output = subprocess.run(
+        [sys.executable, str(manage), 'page_cache_stats',
+         '--settings=stats_settings'],
+        capture_output=True, text=True, env=env, check=True).stdout
+    assert 'Попаданий: 1, промахов: 1' in output, (
+        'Убедитесь, что команда page_cache_stats видит счётчики процесса '
+        'сайта.'
+    )
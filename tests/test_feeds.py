@@ -0,0 +1,116 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def feed_posts(mixer, user, another_user, published_category,
+               another_category):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            'blog.Post', author=author, category=category,
+            is_published=True, pub_date=now - timedelta(hours=index + 1))
+        for index, (author, category) in enumerate([
+            (user, published_category),
+            (another_user, another_category),
+        ])
+    ]
+
+
+def test_feeds_list_visible_posts(client, feed_posts, mixer, user,
+                                  published_category):
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False)
+    response = client.get('/feed/')
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'].startswith('application/rss+xml')
+    content = response.content.decode()
+    for post in feed_posts:
+        assert f'/posts/{post.id}/' in content
+    assert f'/posts/{hidden.id}/' not in content, (
+        'Убедитесь, что в ленту не попадают снятые с публикации посты.'
+    )
+    response = client.get('/feed/atom/')
+    assert response['Content-Type'].startswith('application/atom+xml')
+
+
+def test_category_and_author_feeds(client, feed_posts, published_category,
+                                   another_user):
+    content = client.get(
+        f'/feed/category/{published_category.slug}/').content.decode()
+    assert f'/posts/{feed_posts[0].id}/' in content
+    assert f'/posts/{feed_posts[1].id}/' not in content
+    content = client.get(
+        f'/feed/profile/{another_user.username}/atom/').content.decode()
+    assert f'/posts/{feed_posts[1].id}/' in content
+    assert f'/posts/{feed_posts[0].id}/' not in content
+    assert client.get('/feed/category/missing/').status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_feed_is_cached_and_conditional(client, feed_posts, mixer, user,
+                                        published_category,
+                                        django_assert_num_queries):
+    response = client.get('/feed/')
+    etag, last_modified = response['ETag'], response['Last-Modified']
+    with django_assert_num_queries(0):
+        assert client.get('/feed/').content == response.content
+        assert client.get('/feed/?nocache=1').content == response.content, (
+            'Убедитесь, что параметры запроса не создают новых записей в '
+            'кеше ленты.'
+        )
+        not_modified = client.get('/feed/', HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что повторный опрос ленты отвечает 304 без запросов '
+        'к базе.'
+    )
+    assert client.get(
+        '/feed/', HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(minutes=5))
+    response = client.get('/feed/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert f'/posts/{post.id}/' in response.content.decode(), (
+        'Убедитесь, что кеш ленты сбрасывается при публикации поста.'
+    )
+    post.is_published = False
+    post.save()
+    assert f'/posts/{post.id}/' not in client.get('/feed/').content.decode()
+
+
+def test_feed_expires_at_next_publication(client, settings, clock,
+                                          feed_posts, mixer, user,
+                                          published_category,
+                                          django_assert_num_queries):
+    settings.PUBLICATION_CUTOFF_BUCKET = 30
+    now = timezone.now()
+    scheduled = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(hours=1))
+    content = client.get('/feed/').content
+    with clock(now + timedelta(minutes=30)), django_assert_num_queries(0):
+        assert client.get('/feed/').content == content, (
+            'Убедитесь, что лента остаётся в кеше при смене отсечки '
+            'публикации.'
+        )
+    with clock(now + timedelta(hours=1, minutes=1)):
+        content = client.get('/feed/').content.decode()
+    assert f'/posts/{scheduled.id}/' in content, (
+        'Убедитесь, что кеш ленты истекает, когда наступает время '
+        'отложенной публикации.'
+    )
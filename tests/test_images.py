@@ -0,0 +1,158 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _image_file(width, height, name='large_image.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=(73, 109, 137)).save(
+        buffer, format='JPEG')
+    return ImageFile(buffer, name=name)
+
+
+@pytest.fixture
+def post_with_large_image(
+        mixer, user, published_location, published_category,
+        django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return mixer.blend(
+            'blog.Post', author=user, location=published_location,
+            category=published_category, image=_image_file(2000, 1000))
+
+
+def _stored_width(storage, name):
+    with storage.open(name) as file, Image.open(file) as image:
+        return image.width
+
+
+def test_variants_are_created(user_client, post_with_large_image):
+    post = post_with_large_image
+    post.refresh_from_db()
+    storage = post.image.storage
+    assert post.image_variants['source'] == post.image.name
+    assert (
+        post.image_variants['width'], post.image_variants['height']
+    ) == (2000, 1000), (
+        'Убедитесь, что размеры изображения сохраняются в публикации.'
+    )
+    widths = [width for width, _ in post.image_variants['fallback']]
+    assert widths == [320, 640, 960, 1280], (
+        'Убедитесь, что для изображения создаются копии нескольких размеров.'
+    )
+    for width, name in post.image_variants['sources']['image/webp']:
+        assert name.endswith('.webp')
+        assert _stored_width(storage, name) == width
+    assert post.get_image_url('card').endswith('.640w.jpg')
+
+    content = user_client.get('/').content.decode('utf-8')
+    assert '<source type="image/webp"' in content, (
+        'Убедитесь, что карточка предлагает браузеру копии в формате WebP.'
+    )
+    assert 'width="2000" height="1000"' in content
+    assert f'src="{post.get_image_url("card")}"' in content
+    assert f'src="{post.image.url}"' not in content, (
+        'Убедитесь, что в ленте выводится уменьшенная копия изображения.'
+    )
+    content = user_client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert post.get_image_url('detail') in content
+
+
+def test_placeholder_until_processed(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    post.refresh_from_db()
+    assert post.image_status == 'pending', (
+        'Убедитесь, что изображение обрабатывается не во время запроса.'
+    )
+    content = user_client.get('/').content.decode('utf-8')
+    assert 'img/placeholder.svg' in content, (
+        'Убедитесь, что до обработки изображения выводится заглушка.'
+    )
+
+    from blog.images import run_image_job
+    assert run_image_job(post.id)
+    assert not run_image_job(post.id), (
+        'Убедитесь, что готовое изображение не обрабатывается повторно.'
+    )
+    post.refresh_from_db()
+    assert post.image_status == 'ready'
+    assert post.image_variants['fallback'] == [[100, post.image.name]], (
+        'Убедитесь, что маленькое изображение не увеличивается.'
+    )
+    assert post.get_image_url('card') == post.image.url
+    content = user_client.get('/').content.decode('utf-8')
+    assert 'img/placeholder.svg' not in content
+
+
+@override_settings(IMAGE_PROCESSING_MAX_ATTEMPTS=2)
+def test_failed_processing_is_retried(post_with_published_location):
+    from blog.images import run_image_job
+
+    post = post_with_published_location
+    post.image.storage.delete(post.image.name)
+    post.image.storage.save(post.image.name, ContentFile(b'not an image'))
+    assert not run_image_job(post.id)
+    post.refresh_from_db()
+    assert (post.image_status, post.image_attempts) == ('failed', 1), (
+        'Убедитесь, что ошибка обработки сохраняется в публикации.'
+    )
+    assert not run_image_job(post.id)
+    post.refresh_from_db()
+    assert post.image_attempts == 2
+    assert not run_image_job(post.id)
+    post.refresh_from_db()
+    assert post.image_attempts == 2, (
+        'Убедитесь, что число попыток обработки ограничено.'
+    )
+
+
+def test_replaced_image_drops_old_variants(
+        post_with_large_image, django_capture_on_commit_callbacks):
+    post = post_with_large_image
+    post.refresh_from_db()
+    old_card = post.get_image_url('card').replace(
+        post.image.storage.base_url, '', 1)
+    post.image = _image_file(800, 600, name='replacement.jpg')
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    post.refresh_from_db()
+    assert not post.image.storage.exists(old_card), (
+        'Убедитесь, что копии старого изображения удаляются при замене.'
+    )
+    assert [width for width, _ in post.image_variants['fallback']] == [
+        320, 640, 800]
+
+
+def test_process_images_command(post_with_large_image):
+    post = post_with_large_image
+    type(post).objects.filter(pk=post.pk).update(
+        image_variants={}, image_status='failed', image_attempts=3)
+    call_command('process_images', workers=1)
+    post.refresh_from_db()
+    assert len(post.image_variants['fallback']) == 4, (
+        'Убедитесь, что команда process_images создаёт недостающие копии.'
+    )
+
+
+def test_pool_stops_on_settings_change(post_with_published_location):
+    from blog.images import image_pool
+
+    with override_settings(
+            IMAGE_PROCESSING_WORKERS=1, IMAGE_PROCESSING_RETRY_DELAY=60):
+        image_pool.retry_later(post_with_published_location.id)
+        timers = set(image_pool._timers)
+        assert timers
+    assert not image_pool._timers and image_pool._executor is None
+    for timer in timers:
+        timer.join(1)
+        assert not timer.is_alive(), (
+            'Убедитесь, что отложенные повторы обработки отменяются при '
+            'смене настроек.'
+        )
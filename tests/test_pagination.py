@@ -0,0 +1,93 @@
+import base64
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts_with_same_pub_date(mixer, user, published_location,
+                             published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        location=published_location,
+        pub_date=pub_date,
+    )
+
+
+def _page_ids(response):
+    assert response.status_code == HTTPStatus.OK
+    return [post.id for post in response.context['page_obj']]
+
+
+def test_keyset_pagination_walks_feed(user_client, posts_with_same_pub_date):
+    expected_ids = sorted(
+        (post.id for post in posts_with_same_pub_date), reverse=True)
+
+    first = user_client.get('/')
+    seen_ids = _page_ids(first)
+    page_obj = first.context['page_obj']
+    while page_obj.has_next():
+        response = user_client.get(f'/?after={page_obj.next_cursor}')
+        seen_ids += _page_ids(response)
+        page_obj = response.context['page_obj']
+        assert page_obj.is_keyset
+    assert seen_ids == expected_ids, (
+        'Убедитесь, что переход по курсору `?after=` проходит всю ленту'
+        ' без пропусков и повторов.'
+    )
+
+    response = user_client.get(f'/?before={page_obj.previous_cursor}')
+    assert _page_ids(response) == expected_ids[N_PER_PAGE:N_PER_PAGE * 2], (
+        'Убедитесь, что курсор `?before=` возвращает предыдущую страницу.'
+    )
+
+
+def test_page_number_fallback(user_client, posts_with_same_pub_date):
+    expected_ids = sorted(
+        (post.id for post in posts_with_same_pub_date), reverse=True)
+    response = user_client.get('/?page=2')
+    assert _page_ids(response) == expected_ids[N_PER_PAGE:N_PER_PAGE * 2]
+
+
+def test_invalid_cursor(user_client, posts_with_same_pub_date):
+    response = user_client.get('/?after=not-a-cursor')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    token = base64.urlsafe_b64encode(
+        f'{timezone.now().isoformat()}|{10 ** 30}'.encode()).decode()
+    response = user_client.get(f'/?after={token}')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что курсор с id вне диапазона не приводит к ошибке '
+        'сервера.'
+    )
+
+
+def test_paginator_count_is_cached(user_client, posts_with_same_pub_date):
+    user_client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get('/?page=2')
+    assert not [q for q in queries if 'COUNT(' in q['sql']], (
+        'Убедитесь, что количество публикаций кэшируется пагинатором.'
+    )
+    assert response.context['paginator'].count == len(
+        posts_with_same_pub_date)
+
+    post = posts_with_same_pub_date[0]
+    post.is_published = False
+    post.save()
+    response = user_client.get('/?page=2')
+    assert response.context['paginator'].count == len(
+        posts_with_same_pub_date) - 1, (
+        'Убедитесь, что кэш количества публикаций сбрасывается при снятии'
+        ' публикации.'
+    )
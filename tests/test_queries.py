@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_detail_query_count(
+        mixer, unlogged_client, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    # Проба для ETag, публикация со связанными объектами и комментарии.
+    with django_assert_num_queries(3):
+        response = unlogged_client.get(f'/posts/{post.id}/')
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_hidden_post_detail_query_count(
+        another_user_client, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    # Сессия и пользователь, проба для ETag и поиск публикации.
+    with django_assert_num_queries(4):
+        response = another_user_client.get(f'/posts/{post.id}/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        'blog.Comment', post=post_with_published_location, author=user)
+
+
+def _selects_from(queries, table):
+    return [
+        query for query in queries
+        if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.parametrize('suffix, method, expected', [
+    ('edit/', 'get', 5),
+    ('delete/', 'get', 3),
+])
+def test_post_edit_flow_loads_post_once(
+        user_client, post_with_published_location, django_assert_num_queries,
+        suffix, method, expected):
+    post = post_with_published_location
+    with django_assert_num_queries(expected) as queries:
+        response = getattr(user_client, method)(f'/posts/{post.id}/{suffix}')
+    assert response.status_code == HTTPStatus.OK
+    assert len(_selects_from(queries, 'blog_post')) == 1, (
+        'Убедитесь, что публикация загружается из базы один раз за запрос.'
+    )
+
+
+@pytest.mark.parametrize('action, data', [
+    ('edit_comment', {'text': 'Новый текст'}),
+    ('delete_comment', {}),
+])
+def test_comment_edit_flow_loads_comment_once(
+        user_client, own_comment, django_assert_num_queries,
+        django_capture_on_commit_callbacks, action, data):
+    url = f'/posts/{own_comment.post_id}/{action}/{own_comment.id}/'
+    # Комментарий, сессия, пользователь, изменение и обновление счётчика.
+    with django_assert_num_queries(5) as queries, \
+            django_capture_on_commit_callbacks(execute=True):
+        response = user_client.post(url, data)
+    assert response.status_code == HTTPStatus.FOUND
+    assert response['Location'] == f'/posts/{own_comment.post_id}/'
+    assert len(_selects_from(queries, 'blog_comment')) == 1, (
+        'Убедитесь, что комментарий загружается из базы один раз за запрос.'
+    )
+
+
+def test_server_timing_and_query_budget(
+        user_client, post_with_published_location, caplog, settings):
+    settings.QUERY_BUDGETS = {'blog:index': 100}
+    response = user_client.get('/')
+    assert 'db;dur=' in response['Server-Timing'], (
+        'Убедитесь, что ответ содержит заголовок `Server-Timing`.'
+    )
+    assert 'view;desc="blog:index"' in response['Server-Timing'], (
+        'Убедитесь, что `Server-Timing` называет обработавшее запрос '
+        'представление.'
+    )
+    assert not caplog.records
+
+    settings.QUERY_BUDGETS = {'blog:index': 0}
+    user_client.get('/')
+    assert any('blog:index' in record.getMessage()
+               for record in caplog.records), (
+        'Убедитесь, что превышение бюджета запросов записывается в лог.'
+    )
+
+
+def test_query_budgets_fit_logged_in_cold_cache(
+        mixer, user, user_client, post_with_published_location, caplog):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post, author=user)
+    for url in (
+            '/', f'/category/{post.category.slug}/',
+            f'/profile/{user.username}/', f'/posts/{post.id}/',
+            f'/search/?q={post.title.split()[0]}', '/pages/about/',
+            '/pages/rules/', '/api/posts/', f'/api/posts/{post.id}/',
+            f'/api/posts/{post.id}/comments/', '/api/categories/'):
+        cache.clear()
+        assert user_client.get(url).status_code == HTTPStatus.OK
+    assert not caplog.records, (
+        'Убедитесь, что бюджеты запросов покрывают обычные запросы '
+        'авторизованного пользователя.'
+    )
@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+]
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+
+
+def _post_queries(captured):
+    return [
+        query for query in captured.captured_queries
+        if 'FROM "blog_post"' in query['sql']
+    ]
+
+
+def test_list_views_read_from_replica(replicas, post_with_published_location,
+                                      client):
+    with CaptureQueriesContext(connections['replica']) as replica, \
+            CaptureQueriesContext(connections['default']) as primary:
+        response = client.get('/')
+    assert post_with_published_location.title in response.content.decode()
+    assert _post_queries(replica), (
+        'Убедитесь, что главная страница читает публикации с реплики.'
+    )
+    assert not _post_queries(primary)
+
+
+def test_writes_stick_to_primary(replicas, post_with_published_location,
+                                 user_client):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        {'text': 'Новый комментарий'})
+    assert 'use_primary' in response.cookies, (
+        'Убедитесь, что после записи пользователь какое-то время читает '
+        'данные с основной базы.'
+    )
+    with CaptureQueriesContext(connections['replica']) as replica:
+        user_client.get(f'/posts/{post_with_published_location.id}/')
+    assert not _post_queries(replica)
+
+
+def test_sync_replicas_copies_primary(replicas, monkeypatch, tmp_path,
+                                      post_with_published_location):
+    replica_path = tmp_path / 'replica.sqlite3'
+    monkeypatch.setitem(
+        connections['replica'].settings_dict, 'NAME', str(replica_path))
+    call_command('sync_replicas')
+    with sqlite3.connect(replica_path) as db:
+        titles = [row[0] for row in db.execute('SELECT title FROM blog_post')]
+    assert titles == [post_with_published_location.title]
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    def blend(title, text, is_published=True):
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            title=title, text=text, is_published=is_published,
+            pub_date=timezone.now() - timedelta(days=1))
+
+    return {
+        'title': blend('Путешествие на Байкал', 'Рассказ о поездке.'),
+        'text': blend('Заметки', 'Летом мы ездили на Байкал <b>снова</b>.'),
+        'hidden': blend('Байкал зимой', 'Черновик.', is_published=False),
+        'other': blend('Про котов', 'Ничего общего.'),
+    }
+
+
+def _results(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == 200
+    return response, list(response.context['page_obj'])
+
+
+def test_search_ranks_and_filters(unlogged_client, searchable_posts):
+    response, results = _results(unlogged_client, 'байкал')
+    assert results == [searchable_posts['title'], searchable_posts['text']], (
+        'Убедитесь, что поиск ранжирует совпадения в заголовке выше и'
+        ' скрывает неопубликованные публикации.'
+    )
+    content = response.content.decode('utf-8')
+    assert '<mark>Байкал</mark>' in content, (
+        'Убедитесь, что найденные слова подсвечиваются в результатах.'
+    )
+    assert '<b>снова</b>' not in content
+    assert _results(unlogged_client, 'байк')[1], (
+        'Убедитесь, что поиск находит слова по началу.'
+    )
+    assert _results(unlogged_client, '"*)')[1] == []
+
+
+def test_search_index_follows_posts(unlogged_client, searchable_posts):
+    post = searchable_posts['other']
+    post.title = 'Про собак'
+    post.save()
+    assert _results(unlogged_client, 'котов')[1] == []
+    assert _results(unlogged_client, 'собак')[1] == [post], (
+        'Убедитесь, что поисковый индекс обновляется при сохранении'
+        ' публикации.'
+    )
+    post.delete()
+    assert _results(unlogged_client, 'собак')[1] == []
+
+    call_command('rebuild_search_index')
+    assert len(_results(unlogged_client, 'байкал')[1]) == 2
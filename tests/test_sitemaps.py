@@ -0,0 +1,142 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.sitemaps import get_shard
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def small_shards(settings):
+    cache.clear()
+    settings.SITEMAP_SHARD_SIZE = 2
+    settings.SITEMAP_CHUNK_SIZE = 1
+
+
+@pytest.fixture
+def sitemap_posts(mixer, user, published_category):
+    return [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True,
+            pub_date=timezone.now() - timedelta(hours=index + 1))
+        for index in range(5)
+    ]
+
+
+def get_shard_urls(posts):
+    return {f'/sitemap-posts-{get_shard(post.id)}.xml' for post in posts}
+
+
+def test_sitemap_index_lists_shards(client, sitemap_posts,
+                                    published_category, user):
+    response = client.get('/sitemap.xml')
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == 'application/xml'
+    content = response.content.decode()
+    for url in get_shard_urls(sitemap_posts):
+        assert f'http://testserver{url}</loc>' in content, (
+            'Убедитесь, что индекс карты сайта ссылается на все части.'
+        )
+    assert f'/sitemap-profiles-{get_shard(user.id)}.xml' in content
+    assert f'/sitemap-categories-{get_shard(published_category.id)}' in (
+        content)
+
+
+def test_sitemap_shard_lists_visible_posts(client, sitemap_posts, mixer,
+                                           user, published_category):
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False)
+    content = ''.join(
+        client.get(url).content.decode()
+        for url in get_shard_urls(sitemap_posts + [hidden]))
+    for post in sitemap_posts:
+        assert content.count(f'/posts/{post.id}/</loc>') == 1, (
+            'Убедитесь, что каждая публикация попадает ровно в одну часть '
+            'карты сайта.'
+        )
+    assert f'/posts/{hidden.id}/' not in content, (
+        'Убедитесь, что в карту сайта не попадают снятые с публикации посты.'
+    )
+    assert client.get('/sitemap-missing-0.xml').status_code == (
+        HTTPStatus.NOT_FOUND)
+    beyond = get_shard(max(post.id for post in sitemap_posts)) + 1
+    assert client.get(f'/sitemap-posts-{beyond}.xml').status_code == (
+        HTTPStatus.NOT_FOUND), (
+        'Убедитесь, что пустые части карты сайта отвечают 404.'
+    )
+
+
+def test_sitemap_shards_are_cached(client, sitemap_posts):
+    first, last = sitemap_posts[0], sitemap_posts[-1]
+    first_url = f'/sitemap-posts-{get_shard(first.id)}.xml'
+    last_url = f'/sitemap-posts-{get_shard(last.id)}.xml'
+    for url in ('/sitemap.xml', first_url, last_url):
+        client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(first_url)
+        client.get(f'{first_url}?nocache=1')
+    assert response.status_code == HTTPStatus.OK
+    assert not queries.captured_queries, (
+        'Убедитесь, что части карты сайта кешируются.'
+    )
+    etag = response['ETag']
+    assert client.get(first_url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.NOT_MODIFIED)
+
+    last.title = 'Новый заголовок'
+    last.save()
+    with CaptureQueriesContext(connection) as queries:
+        client.get(first_url)
+    assert not queries.captured_queries, (
+        'Убедитесь, что изменение публикации перестраивает только её часть '
+        'карты сайта.'
+    )
+    with CaptureQueriesContext(connection) as queries:
+        client.get(last_url)
+        client.get('/sitemap.xml')
+    assert queries.captured_queries
+
+
+def test_robots_txt(client):
+    response = client.get('/robots.txt')
+    assert response['Content-Type'] == 'text/plain'
+    content = response.content.decode()
+    assert 'Disallow: /*?page=' in content, (
+        'Убедитесь, что robots.txt запрещает обход страниц пагинации.'
+    )
+    assert 'Sitemap: http://testserver/sitemap.xml' in content
+
+
+def test_scheduled_post_enters_sitemap(client, settings, clock, mixer,
+                                       user, published_category,
+                                       django_assert_num_queries):
+    settings.PUBLICATION_CUTOFF_BUCKET = 30
+    now = timezone.now()
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(minutes=10))
+    url = f'/sitemap-posts-{get_shard(post.id)}.xml'
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    index = client.get('/sitemap.xml').content
+    assert url not in index.decode()
+    with clock(now + timedelta(minutes=5)), django_assert_num_queries(0):
+        assert client.get('/sitemap.xml').content == index, (
+            'Убедитесь, что индекс карты сайта остаётся в кеше при смене '
+            'отсечки публикации.'
+        )
+    with clock(now + timedelta(minutes=11)):
+        response = client.get(url)
+        index = client.get('/sitemap.xml').content.decode()
+    assert f'/posts/{post.id}/' in response.content.decode(), (
+        'Убедитесь, что отложенная публикация попадает в карту сайта, когда '
+        'наступает время публикации.'
+    )
+    assert url in index